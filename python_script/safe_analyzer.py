@@ -19,64 +19,91 @@ Features:
 """
 
 import requests
+import asyncio
 import json
 import time
 import argparse
 import sys
 import csv
-from typing import Dict, List, Optional, Union, Any
+import hashlib
+import sqlite3
+import threading
+import random
+import socket
+import contextvars
+from collections import deque
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import ReadTimeoutError
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Generator, List, Optional, Union, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 import re
 
+try:
+    import aiohttp
+except ImportError:  # optional, only needed by AsyncSafeAnalyzer
+    aiohttp = None
+
+try:
+    import ijson
+except ImportError:  # optional, parses large responses incrementally
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:  # optional, speeds up decoding owner lists of large batches
+    np = None
+
 # Chain configurations matching the web app
 SUPPORTED_CHAINS = {
     "ethereum": {
         "name": "Ethereum",
-        "rpc_url": "https://eth.meowrpc.com",
-        "backup_rpc_url": "https://eth.drpc.org",
+        "rpc_urls": ["https://eth.meowrpc.com", "https://eth.drpc.org"],
         "explorer_api": "https://api.etherscan.io/v2/api",
         "explorer_url": "https://etherscan.io",
+        "multicall3_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
         "chain_id": 1
     },
     "arbitrum": {
         "name": "Arbitrum",
-        "rpc_url": "https://arbitrum.drpc.org",
-        "backup_rpc_url": "https://arb1.arbitrum.io/rpc",
+        "rpc_urls": ["https://arbitrum.drpc.org", "https://arb1.arbitrum.io/rpc"],
         "explorer_api": "https://api.etherscan.io/v2/api",
         "explorer_url": "https://arbiscan.io",
+        "multicall3_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
         "chain_id": 42161
     },
     "base": {
         "name": "Base",
-        "rpc_url": "https://base.meowrpc.com",
-        "backup_rpc_url": "https://base.drpc.org",
+        "rpc_urls": ["https://base.meowrpc.com", "https://base.drpc.org"],
         "explorer_api": "https://api.etherscan.io/v2/api",
         "explorer_url": "https://basescan.org",
+        "multicall3_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
         "chain_id": 8453
     },
     "optimism": {
         "name": "Optimism",
-        "rpc_url": "https://optimism.drpc.org",
-        "backup_rpc_url": "https://mainnet.optimism.io",
+        "rpc_urls": ["https://optimism.drpc.org", "https://mainnet.optimism.io"],
         "explorer_api": "https://api.etherscan.io/v2/api",
         "explorer_url": "https://optimistic.etherscan.io",
+        "multicall3_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
         "chain_id": 10
     },
     "polygon": {
         "name": "Polygon",
-        "rpc_url": "https://polygon.drpc.org",
-        "backup_rpc_url": "https://polygon-rpc.com",
+        "rpc_urls": ["https://polygon.drpc.org", "https://polygon-rpc.com"],
         "explorer_api": "https://api.etherscan.io/v2/api",
         "explorer_url": "https://polygonscan.com",
+        "multicall3_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
         "chain_id": 137
     },
     "katana": {
         "name": "Katana",
-        "rpc_url": "https://katana.drpc.org",
-        "backup_rpc_url": "https://katana.drpc.org",
+        "rpc_urls": ["https://katana.drpc.org"],
         "explorer_api": "https://api.etherscan.io/v2/api",
         "explorer_url": "https://katana-explorer.com",
+        "multicall3_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
         "chain_id": 747474
     }
 }
@@ -88,10 +115,559 @@ GNOSIS_SAFE_ABI = [
     {"inputs": [], "name": "getOwners", "outputs": [{"type": "address[]"}], "stateMutability": "view", "type": "function"},
     {"inputs": [], "name": "nonce", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
     {"inputs": [{"type": "address"}, {"type": "uint256"}], "name": "getModulesPaginated", "outputs": [{"type": "address[]"}, {"type": "address"}], "stateMutability": "view", "type": "function"},
-    {"inputs": [], "name": "getGuard", "outputs": [{"type": "address"}], "stateMutability": "view", "type": "function"},
-    {"inputs": [], "name": "getFallbackHandler", "outputs": [{"type": "address"}], "stateMutability": "view", "type": "function"},
 ]
 
+# Keccak-256 as used by Ethereum (original Keccak padding, not NIST SHA3-256),
+# needed for function selectors, event topics and storage slot constants.
+KECCAK_RATE = 136  # bytes absorbed per permutation for 256-bit output
+
+def _keccak_f1600(lanes: List[List[int]]) -> List[List[int]]:
+    """The Keccak-f[1600] permutation on a 5x5 array of 64-bit lanes, lanes[x][y]"""
+    mask = (1 << 64) - 1
+    rc = 1
+    for _ in range(24):
+        # theta
+        c = [lanes[x][0] ^ lanes[x][1] ^ lanes[x][2] ^ lanes[x][3] ^ lanes[x][4] for x in range(5)]
+        d = [c[(x + 4) % 5] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & mask) for x in range(5)]
+        lanes = [[lanes[x][y] ^ d[x] for y in range(5)] for x in range(5)]
+        # rho and pi
+        x, y = 1, 0
+        current = lanes[x][y]
+        for t in range(24):
+            x, y = y, (2 * x + 3 * y) % 5
+            shift = ((t + 1) * (t + 2) // 2) % 64
+            current, lanes[x][y] = lanes[x][y], ((current << shift) | (current >> (64 - shift))) & mask
+        # chi
+        for y in range(5):
+            row = [lanes[x][y] for x in range(5)]
+            for x in range(5):
+                lanes[x][y] = row[x] ^ (~row[(x + 1) % 5] & row[(x + 2) % 5])
+        # iota
+        for j in range(7):
+            rc = ((rc << 1) ^ ((rc >> 7) * 0x71)) % 256
+            if rc & 2:
+                lanes[0][0] ^= 1 << ((1 << j) - 1)
+    return lanes
+
+def keccak256(data: Union[bytes, str]) -> bytes:
+    """Keccak-256 digest of `data` (str is UTF-8 encoded)"""
+    if isinstance(data, str):
+        data = data.encode()
+    padded = bytearray(data) + b"\x01" + bytes(-(len(data) + 1) % KECCAK_RATE)
+    padded[-1] |= 0x80
+    lanes = [[0] * 5 for _ in range(5)]
+    for block in range(0, len(padded), KECCAK_RATE):
+        for i in range(KECCAK_RATE // 8):
+            lanes[i % 5][i // 5] ^= int.from_bytes(padded[block + 8 * i:block + 8 * i + 8], "little")
+        lanes = _keccak_f1600(lanes)
+    return b"".join(lanes[i % 5][i // 5].to_bytes(8, "little") for i in range(4))
+
+# ABI decoding works on bytes/memoryview: words are read with int.from_bytes and
+# addresses hex-encoded straight from their 20-byte slice, without slicing and
+# re-parsing hex strings. Dynamic values take the offset their head is relative
+# to (`base`), 0 at the top level.
+
+def hex_to_bytes(value: Optional[str]) -> Optional[bytes]:
+    """Decode 0x-prefixed hex return data, None for empty results"""
+    if not value or value == "0x":
+        return None
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+def _abi_uint(data: Union[bytes, memoryview], pos: int) -> int:
+    if len(data) < pos + 32:
+        raise ValueError("ABI data too short")
+    return int.from_bytes(data[pos:pos + 32], "big")
+
+def _abi_address(data: Union[bytes, memoryview], pos: int) -> str:
+    if pos + 32 > len(data):
+        raise ValueError("ABI data too short")
+    return "0x" + data[pos + 12:pos + 32].hex()
+
+def _abi_bool(data: Union[bytes, memoryview], pos: int) -> bool:
+    return _abi_uint(data, pos) != 0
+
+def _abi_bytes32(data: Union[bytes, memoryview], pos: int) -> bytes:
+    if pos + 32 > len(data):
+        raise ValueError("ABI data too short")
+    return bytes(data[pos:pos + 32])
+
+def _abi_bytes(data: Union[bytes, memoryview], pos: int, base: int = 0) -> Union[bytes, memoryview]:
+    start = base + int.from_bytes(data[pos:pos + 32], "big") + 32
+    end = start + int.from_bytes(data[start - 32:start], "big")
+    if end > len(data) or pos + 32 > len(data):
+        raise ValueError("ABI data too short")
+    return data[start:end]
+
+def _abi_string(data: Union[bytes, memoryview], pos: int, base: int = 0) -> str:
+    return str(_abi_bytes(data, pos, base), "utf-8")
+
+def _abi_address_array(data: Union[bytes, memoryview], pos: int, base: int = 0) -> List[str]:
+    start = base + int.from_bytes(data[pos:pos + 32], "big")
+    first = start + 32
+    end = first + 32 * int.from_bytes(data[start:first], "big")
+    if end > len(data) or first > len(data):
+        raise ValueError("ABI data too short")
+    # One hex conversion for the whole array, then take the low 20 bytes of each word
+    words = data[first:end].hex()
+    return ["0x" + words[i + 24:i + 64] for i in range(0, len(words), 64)]
+
+ABI_DECODERS = {
+    "uint256": _abi_uint,
+    "address": _abi_address,
+    "bool": _abi_bool,
+    "bytes32": _abi_bytes32,
+    "bytes": _abi_bytes,
+    "string": _abi_string,
+    "address[]": _abi_address_array,
+}
+
+# ABI encoding of single values into their head word (static types) or tail (dynamic types)
+
+def _abi_encode_uint(value: int) -> bytes:
+    return int(value).to_bytes(32, "big")
+
+def _abi_encode_address(value: str) -> bytes:
+    raw = bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    if len(raw) != 20:
+        raise ValueError(f"Invalid address: {value}")
+    return raw.rjust(32, b"\0")
+
+def _abi_encode_bool(value: bool) -> bytes:
+    return (1 if value else 0).to_bytes(32, "big")
+
+def _abi_encode_bytes32(value: Union[bytes, str]) -> bytes:
+    raw = (hex_to_bytes(value) or b"") if isinstance(value, str) else bytes(value)
+    if len(raw) > 32:
+        raise ValueError("bytes32 value longer than 32 bytes")
+    return raw.ljust(32, b"\0")
+
+def _abi_encode_bytes(value: Union[bytes, str]) -> bytes:
+    raw = (hex_to_bytes(value) or b"") if isinstance(value, str) else bytes(value)
+    return len(raw).to_bytes(32, "big") + raw.ljust(-(-len(raw) // 32) * 32, b"\0")
+
+def _abi_encode_string(value: str) -> bytes:
+    return _abi_encode_bytes(value.encode("utf-8"))
+
+ABI_ENCODERS = {
+    "uint256": _abi_encode_uint,
+    "address": _abi_encode_address,
+    "bool": _abi_encode_bool,
+    "bytes32": _abi_encode_bytes32,
+    "bytes": _abi_encode_bytes,
+    "string": _abi_encode_string,
+}
+
+ABI_DYNAMIC_TYPES = {"bytes", "string"}
+
+def _split_abi_tuple(abi_type: str) -> List[str]:
+    """Component types of a canonical tuple type such as "(address,bool,bytes)" """
+    components = []
+    depth = 0
+    current = ""
+    for char in abi_type[1:-1]:
+        if char == "," and depth == 0:
+            components.append(current)
+            current = ""
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current += char
+    if current:
+        components.append(current)
+    return components
+
+def _abi_encode_sequence(items: List[tuple], values: Any) -> bytes:
+    """Head/tail encode `values` with compiled types (encoder, decoder, dynamic, head size)"""
+    values = list(values)
+    if len(values) != len(items):
+        raise ValueError(f"Expected {len(items)} ABI values, got {len(values)}")
+    heads = []
+    tails = []
+    tail_offset = sum(item[3] for item in items)
+    for (encoder, _, dynamic, _), value in zip(items, values):
+        encoded = encoder(value)
+        if dynamic:
+            heads.append(tail_offset.to_bytes(32, "big"))
+            tails.append(encoded)
+            tail_offset += len(encoded)
+        else:
+            heads.append(encoded)
+    return b"".join(heads + tails)
+
+def _compile_abi_type(abi_type: str) -> tuple:
+    """Compile a canonical ABI type into (encoder, decoder, dynamic, head size).
+
+    Supports uint<N>, address, bool, bytes32, bytes, string, tuples and
+    dynamic arrays of any of these. Static decoders take (data, pos); dynamic
+    ones (data, pos, base) with `base` the offset their head is relative to.
+    """
+    if abi_type.endswith("[]"):
+        element = _compile_abi_type(abi_type[:-2])
+        element_decoder, element_dynamic, element_size = element[1], element[2], element[3]
+
+        def encode_array(values):
+            return len(values).to_bytes(32, "big") + _abi_encode_sequence([element] * len(values), values)
+
+        def decode_array(data, pos, base=0):
+            start = base + _abi_uint(data, pos)
+            content = start + 32
+            count = _abi_uint(data, start)
+            if content + element_size * count > len(data):
+                raise ValueError("ABI data too short")
+            if element_dynamic:
+                return [element_decoder(data, head, content) for head in range(content, content + element_size * count, element_size)]
+            return [element_decoder(data, head) for head in range(content, content + element_size * count, element_size)]
+
+        return encode_array, ABI_DECODERS.get(abi_type, decode_array), True, 32
+
+    if abi_type.startswith("("):
+        components = [_compile_abi_type(component) for component in _split_abi_tuple(abi_type)]
+        offsets = []
+        size = 0
+        for component in components:
+            offsets.append(size)
+            size += component[3]
+        dynamic = any(component[2] for component in components)
+
+        def encode_tuple(values):
+            return _abi_encode_sequence(components, values)
+
+        def decode_components(data, start):
+            return tuple(
+                component[1](data, start + offset, start) if component[2] else component[1](data, start + offset)
+                for component, offset in zip(components, offsets)
+            )
+
+        if dynamic:
+            def decode_tuple(data, pos, base=0):
+                return decode_components(data, base + _abi_uint(data, pos))
+            return encode_tuple, decode_tuple, True, 32
+        return encode_tuple, decode_components, False, size
+
+    if abi_type.startswith("uint"):
+        abi_type = "uint256"  # narrower uints share the 32-byte word encoding
+    if abi_type not in ABI_ENCODERS:
+        raise ValueError(f"Unsupported ABI type: {abi_type}")
+    return ABI_ENCODERS[abi_type], ABI_DECODERS[abi_type], abi_type in ABI_DYNAMIC_TYPES, 32
+
+def canonical_abi_type(param: Dict[str, Any]) -> str:
+    """Canonical type string of an ABI parameter, expanding tuple components"""
+    abi_type = param["type"]
+    if abi_type.startswith("tuple"):
+        return "(" + ",".join(canonical_abi_type(c) for c in param["components"]) + ")" + abi_type[5:]
+    return abi_type
+
+def make_decode_plan(types: List[str]) -> tuple:
+    """Precompute (head offset, decoder) pairs for a list of ABI output types"""
+    plan = []
+    offset = 0
+    for abi_type in types:
+        _, decoder, _, head_size = _compile_abi_type(abi_type)
+        plan.append((offset, decoder))
+        offset += head_size
+    return tuple(plan)
+
+def abi_decode(plan: tuple, data: Union[bytes, memoryview]) -> tuple:
+    """Decode return data with a plan from make_decode_plan. Raises ValueError on malformed data"""
+    return tuple([decoder(data, offset) for offset, decoder in plan])
+
+class AbiFunction:
+    """An ABI function entry compiled once into its selector and encode/decode plans"""
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.name = entry["name"]
+        input_types = [canonical_abi_type(param) for param in entry.get("inputs", [])]
+        self.output_types = [canonical_abi_type(param) for param in entry.get("outputs", [])]
+        self.signature = f"{self.name}({','.join(input_types)})"
+        self.selector = keccak256(self.signature)[:4]
+        self.selector_hex = "0x" + self.selector.hex()
+        self.input_plan = [_compile_abi_type(abi_type) for abi_type in input_types]
+        self.output_plan = make_decode_plan(self.output_types)
+
+    def encode_call(self, *args) -> str:
+        """0x-prefixed call data for this function with `args`"""
+        if not args and not self.input_plan:
+            return self.selector_hex
+        return "0x" + (self.selector + _abi_encode_sequence(self.input_plan, args)).hex()
+
+    def encode_calls(self, args_list: List[tuple]) -> List[str]:
+        """Call data for every argument tuple in `args_list`"""
+        return [self.encode_call(*args) for args in args_list]
+
+    def decode_output(self, data: Union[bytes, memoryview]) -> tuple:
+        """Decode return data into a tuple of outputs. Raises ValueError on malformed data"""
+        return abi_decode(self.output_plan, data)
+
+    def decode_outputs(self, payloads: List[Optional[Union[bytes, memoryview]]]) -> List[Optional[tuple]]:
+        """Decode many return payloads, None for missing or malformed ones"""
+        decoded = []
+        for data in payloads:
+            try:
+                decoded.append(abi_decode(self.output_plan, data) if data else None)
+            except (ValueError, UnicodeDecodeError):
+                decoded.append(None)
+        return decoded
+
+def compile_abi(abi: List[Dict[str, Any]]) -> Dict[str, AbiFunction]:
+    """Compile the function entries of an ABI, keyed by function name"""
+    return {entry["name"]: AbiFunction(entry) for entry in abi if entry.get("type") == "function"}
+
+# Compiled Safe ABI; selectors and plans are computed once at import
+SAFE_ABI = compile_abi(GNOSIS_SAFE_ABI)
+
+# Decode plans for the Safe getters, keyed by function name
+SAFE_DECODE_PLANS = {name: function.output_plan for name, function in SAFE_ABI.items()}
+
+# Single-value Safe getters: (function name, Safe data field, decoder of the value)
+SAFE_GETTER_FIELDS = tuple(
+    (func_name, field, SAFE_DECODE_PLANS[func_name][0][1])
+    for func_name, field in (("VERSION", "version"), ("getThreshold", "threshold"),
+                             ("nonce", "nonce"), ("getOwners", "owners"))
+)
+
+# Batches with at least this many payloads decode their address arrays in one
+# vectorized pass (see bulk_decode_address_arrays)
+BULK_DECODE_MIN_PAYLOADS = 64
+
+class PackedAddresses:
+    """Address lists of many payloads stored as fixed-width 20-byte rows.
+
+    `data` is a (M, 20) uint8 NumPy array, or M * 20 bytes without NumPy.
+    List i is rows offsets[i]:offsets[i + 1]; `valid[i]` is False when
+    payload i did not decode, in which case addresses(i) returns None.
+    """
+
+    def __init__(self, data: Any, offsets: List[int], valid: List[bool]):
+        self.data = data
+        self.offsets = offsets
+        self.valid = valid
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def raw(self, i: int) -> bytes:
+        """Concatenated 20-byte addresses of list i"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        if np is not None and isinstance(self.data, np.ndarray):
+            return self.data[start:end].tobytes()
+        return self.data[20 * start:20 * end]
+
+    def addresses(self, i: int) -> Optional[List[str]]:
+        """Checksum-free 0x-prefixed addresses of list i, None if it did not decode"""
+        if not self.valid[i]:
+            return None
+        words = self.raw(i).hex()
+        return ["0x" + words[j:j + 40] for j in range(0, len(words), 40)]
+
+def bulk_decode_address_arrays(payloads: List[Optional[Union[bytes, memoryview]]], pos: int = 0) -> PackedAddresses:
+    """Decode the address[] at head offset `pos` of many return payloads at once.
+
+    With NumPy the payloads are concatenated into one uint8 buffer and all
+    offsets, lengths and address words are gathered with array indexing, so
+    the cost no longer grows with one Python-level decode per payload. The
+    addresses stay packed in a (M, 20) array until a list is asked for.
+    Without NumPy the same layout is built in pure Python. Missing or
+    malformed payloads are marked invalid instead of failing the batch.
+    """
+    if np is None:
+        return _bulk_decode_address_arrays_python(payloads, pos)
+
+    count = len(payloads)
+    payloads = [payload if payload is not None else b"" for payload in payloads]
+    lengths = np.fromiter((len(payload) for payload in payloads), dtype=np.int64, count=count)
+    bases = np.zeros(count, dtype=np.int64)
+    np.cumsum(lengths[:-1], out=bases[1:])
+    # Trailing padding keeps gathers of invalid payloads (read at base 0) in bounds
+    buffer = np.frombuffer(b"".join(payloads) + bytes(32), dtype=np.uint8)
+    word = np.arange(32, dtype=np.int64)
+
+    def read_uints(positions: Any, valid: Any) -> Any:
+        raw = buffer[np.where(valid, positions, 0)[:, None] + word]
+        # Anything past 2^32 cannot be an in-bounds offset or length
+        fits = ~raw[:, :28].any(axis=1)
+        values = raw[:, 28:].copy().view(">u4").ravel().astype(np.int64)
+        return np.where(valid & fits, values, 0), valid & fits
+
+    valid = lengths >= pos + 32
+    starts, valid = read_uints(bases + pos, valid)
+    valid &= starts + 32 <= lengths
+    counts, valid = read_uints(bases + starts, valid)
+    valid &= starts + 32 + 32 * counts <= lengths
+    counts = np.where(valid, counts, 0)
+
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    total = int(offsets[-1])
+    word_positions = (np.repeat(bases + starts + 32 - 32 * offsets[:-1], counts)
+                      + 32 * np.arange(total, dtype=np.int64))
+    words = buffer[word_positions[:, None] + word]
+
+    # An address word with non-zero high bytes invalidates its payload
+    dirty = words[:, :12].any(axis=1)
+    if dirty.any():
+        owner = np.repeat(np.arange(count), counts)
+        valid &= np.bincount(owner[dirty], minlength=count) == 0
+
+    return PackedAddresses(np.ascontiguousarray(words[:, 12:]), offsets.tolist(), valid.tolist())
+
+def _bulk_decode_address_arrays_python(payloads: List[Optional[Union[bytes, memoryview]]], pos: int) -> PackedAddresses:
+    chunks = []
+    offsets = [0]
+    valid = []
+    for payload in payloads:
+        try:
+            if payload is None or len(payload) < pos + 32:
+                raise ValueError("ABI data too short")
+            start = int.from_bytes(payload[pos:pos + 32], "big")
+            first = start + 32
+            end = first + 32 * int.from_bytes(payload[start:first], "big")
+            if end > len(payload) or first > len(payload):
+                raise ValueError("ABI data too short")
+            rows = [payload[i:i + 32] for i in range(first, end, 32)]
+            if any(any(row[:12]) for row in rows):
+                raise ValueError("Address word with non-zero high bytes")
+        except ValueError:
+            offsets.append(offsets[-1])
+            valid.append(False)
+            continue
+        chunks.extend(bytes(row[12:]) for row in rows)
+        offsets.append(offsets[-1] + len(rows))
+        valid.append(True)
+    return PackedAddresses(b"".join(chunks), offsets, valid)
+
+# Start and end marker of the Safe's module linked list
+SENTINEL_MODULES = "0x0000000000000000000000000000000000000001"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+def _packed_modules(packed: PackedAddresses, i: int) -> List[str]:
+    """Module page i of a bulk-decoded batch as a list, without the sentinel"""
+    return [module for module in packed.addresses(i) if module != SENTINEL_MODULES]
+
+# Modules requested per getModulesPaginated page. Large enough that nearly every
+# Safe needs one page; longer lists are walked in further batched rounds.
+MODULE_PAGE_SIZE = 1000
+MODULE_MAX_PAGES = 100
+
+def encode_modules_paginated(start: str, page_size: int) -> str:
+    """Call data for getModulesPaginated(address start, uint256 pageSize)"""
+    return SAFE_ABI["getModulesPaginated"].encode_call(start, page_size)
+
+def decode_modules_page(result: bytes) -> tuple:
+    """Decode a getModulesPaginated return into (modules, next)"""
+    modules, next_module = SAFE_ABI["getModulesPaginated"].decode_output(result)
+    if SENTINEL_MODULES in modules:
+        modules = [module for module in modules if module != SENTINEL_MODULES]
+    return modules, next_module
+
+# Safe getters read for every analysis, keyed by function name
+SAFE_FUNCTION_SIGS = {
+    "VERSION": SAFE_ABI["VERSION"].encode_call(),
+    "getThreshold": SAFE_ABI["getThreshold"].encode_call(),
+    "getOwners": SAFE_ABI["getOwners"].encode_call(),
+    "nonce": SAFE_ABI["nonce"].encode_call(),
+    "getModulesPaginated": encode_modules_paginated(SENTINEL_MODULES, MODULE_PAGE_SIZE),
+}
+
+# Safe storage slots read with eth_getStorageAt. The Safe has no getters for
+# these, and reading the slots works on every version (unset slots read as zero).
+SAFE_STORAGE_SLOTS = {
+    "guard": "0x" + keccak256("guard_manager.guard.address").hex(),
+    "fallback_handler": "0x" + keccak256("fallback_manager.handler.address").hex(),
+}
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [{"type": "tuple[]", "components": [
+            {"name": "target", "type": "address"},
+            {"name": "allowFailure", "type": "bool"},
+            {"name": "callData", "type": "bytes"},
+        ]}],
+        "name": "aggregate3",
+        "outputs": [{"type": "tuple[]", "components": [
+            {"name": "success", "type": "bool"},
+            {"name": "returnData", "type": "bytes"},
+        ]}],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+MULTICALL3_AGGREGATE3 = compile_abi(MULTICALL3_ABI)["aggregate3"]
+
+# Maximum number of calls packed into one aggregate3 call when prefetching
+# batches, and into one JSON-RPC batch of per-address reads
+MULTICALL_CHUNK_SIZE = 500
+
+# Addresses per explorer getcontractcreation call (the explorer's maximum)
+CONTRACT_CREATION_BATCH_SIZE = 5
+
+# Last activity from Safe execution logs. Safe 1.1.1 and 1.3.0 declare both
+# events with a plain txHash and 1.4.x indexes it, but the signature (topic 0)
+# is the same, so one filter matches every version
+SAFE_EXECUTION_EVENTS = ("ExecutionSuccess(bytes32,uint256)", "ExecutionFailure(bytes32,uint256)")
+SAFE_EXECUTION_TOPICS = ["0x" + keccak256(event).hex() for event in SAFE_EXECUTION_EVENTS]
+LAST_ACTIVITY_SOURCES = ("auto", "rpc", "explorer")
+LOG_SCAN_INITIAL_WINDOW = 10_000  # blocks in the first eth_getLogs window below the head, doubled per window
+LOG_SCAN_MAX_WINDOW = 1_000_000
+LOG_SCAN_MIN_WINDOW = 100  # a window that still fails at this size ends the scan
+LOG_SCAN_MAX_REQUESTS = 64  # eth_getLogs round trips per scan; Safes not settled by then stay unknown
+LOG_SCAN_ADDRESSES_PER_FILTER = 100
+LOG_SCAN_MAX_FILTERS_PER_REQUEST = 50  # eth_getLogs filters batched together once the node caps their block range
+INACTIVITY_ERROR_DAYS = 90  # the scan stops here; Safes without an execution this recent fail the activity check
+
+# RPC endpoint scoring
+ENDPOINT_EWMA_ALPHA = 0.2  # weight of the newest sample in latency/error EWMAs
+ENDPOINT_UNHEALTHY_ERROR_RATE = 0.5  # endpoints above this error rate are only used as a last resort
+ENDPOINT_EXPLORE_PROBABILITY = 0.05  # share of requests routed to a random endpoint to refresh its score
+ENDPOINT_UNMEASURED_LATENCY = 1.0  # seconds assumed for endpoints that have only failed so far
+
+# Adaptive rate limiting (token bucket rate with AIMD, plus an AIMD concurrency cap)
+RPC_RATE_LIMIT = {"rate": 20.0, "min_rate": 1.0, "max_rate": 500.0, "concurrency": 4, "max_concurrency": 1024}
+EXPLORER_RATE_LIMIT = {"rate": 5.0, "min_rate": 0.5, "max_rate": 20.0, "concurrency": 2, "max_concurrency": 8}
+RATE_LIMIT_INCREASE = 2.0  # additive increase, in requests/second per second of successful traffic
+RATE_LIMIT_DECREASE_FACTOR = 0.7  # multiplicative decrease on 429s and timeouts
+RATE_LIMIT_DECREASE_COOLDOWN = 1.0  # seconds, one decrease per burst of throttled responses
+RATE_LIMIT_POLL_INTERVAL = 0.01
+
+# Circuit breaker for dead RPC endpoints
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures that open the circuit
+CIRCUIT_BREAKER_COOLDOWN = 30.0  # seconds before an open circuit lets a probe request through
+
+# Retries of failed requests, with capped exponential backoff and full jitter
+RETRY_MAX_ATTEMPTS = 3  # retries after the first try
+RETRY_BASE_DELAY = 0.5  # seconds, doubled on every retry
+RETRY_MAX_DELAY = 8.0
+
+# Async engine defaults
+ASYNC_CONCURRENCY = 100  # Safes analyzed at once by AsyncSafeAnalyzer.analyze_many
+ASYNC_CONNECTION_LIMIT = 1000  # upper bound on pooled RPC connections
+ASYNC_CONNECTIONS_PER_ANALYSIS = 4  # RPC connections budgeted per concurrent analysis
+
+# Connection pools, one per host class: "rpc", "explorer" and "github" (release lookups)
+TRANSPORT_POOL_SIZES = {  # connections per host; RPC pools are sized from the worker count instead
+    "explorer": EXPLORER_RATE_LIMIT["max_concurrency"],
+    "github": 2,
+}
+TRANSPORT_POOL_HOSTS = 16  # hosts per class that keep their own pool
+TRANSPORT_KEEPALIVE_TIMEOUT = 60  # seconds an idle connection stays pooled (aiohttp)
+TRANSPORT_DNS_CACHE_TTL = 300  # seconds (aiohttp)
+HTTP_ACCEPT_ENCODING = "gzip, deflate"  # JSON-RPC and explorer bodies compress several-fold
+STREAM_JSON_MIN_BYTES = 256 * 1024  # bodies at least this large (or of unknown size) are parsed with ijson
+
+# Hedged request defaults
+HEDGE_PERCENTILE = 95  # hedge once the primary is slower than this percentile of its latencies
+HEDGE_LATENCY_WINDOW = 200  # recent latency samples kept per endpoint
+HEDGE_MIN_SAMPLES = 10  # samples needed before the percentile is trusted
+HEDGE_DEFAULT_DELAY = 1.0  # seconds, used until enough samples exist
+HEDGE_MIN_DELAY = 0.05
+HEDGE_MAX_WORKERS = 8
+
+# RPC response cache defaults
+RPC_CACHE_LATEST_TTL = 60  # seconds a response read at "latest" stays valid
+RPC_CACHE_MAX_ENTRIES = 100000
+RPC_CACHE_CONFIRMATIONS = 64  # blocks below the head after which a block's state is cached for good
+SQLITE_COMMIT_INTERVAL = 256  # writes buffered before a commit (the rest are committed by flush/close)
+RPC_CACHE_PURGE_INTERVAL = 5000  # writes between sweeps for expired entries
+RPC_CACHE_EVICT_FRACTION = 0.1  # share of max_entries freed at once when the cache is full
+
 # Official Safe fallback handlers
 OFFICIAL_SAFE_FALLBACK_HANDLERS = {
     '0x017062a1de2fe6b99be3d9d37841fed19f573804': 'CompatibilityFallbackHandler',
@@ -108,6 +684,92 @@ OFFICIAL_SAFE_FALLBACK_HANDLERS = {
     '0x727a77a074d1e6c4530e814f89e618a3298fc044': 'SimulateTxAccessor',
 }
 
+# Safe proxies of every release forward masterCopy() themselves and are a
+# couple hundred bytes long
+SAFE_PROXY_MASTER_COPY_SELECTOR = keccak256("masterCopy()")[:4].hex()
+SAFE_PROXY_MAX_CODE_SIZE = 512
+
+def encode_aggregate3(calls: List[tuple]) -> str:
+    """ABI-encode a Multicall3 aggregate3 call with allowFailure set on every call.
+
+    `calls` is a list of (target, call_data) tuples with 0x-prefixed hex strings.
+    """
+    return MULTICALL3_AGGREGATE3.encode_call([(target, True, call_data) for target, call_data in calls])
+
+def decode_aggregate3(result: str) -> List[tuple]:
+    """Decode aggregate3 return data into a list of (success, return_data) tuples.
+
+    The response hex is decoded to bytes once; every return_data is a
+    memoryview into that buffer. Hand-inlined equivalent of
+    MULTICALL3_AGGREGATE3.decode_output, which this hot path outruns.
+    """
+    data = memoryview(hex_to_bytes(result) or b"")
+    size = len(data)
+    from_bytes = int.from_bytes
+    array_start = _abi_uint(data, 0)
+    array_length = _abi_uint(data, array_start)
+    elements_start = array_start + 32
+    if elements_start + 32 * array_length > size:
+        raise ValueError("Truncated aggregate3 return data")
+
+    decoded = []
+    for head in range(elements_start, elements_start + 32 * array_length, 32):
+        tuple_start = elements_start + from_bytes(data[head:head + 32], "big")
+        data_start = tuple_start + from_bytes(data[tuple_start + 32:tuple_start + 64], "big")
+        data_end = data_start + 32 + from_bytes(data[data_start:data_start + 32], "big")
+        if data_end > size or tuple_start + 64 > size:
+            raise ValueError("Truncated aggregate3 return data")
+        decoded.append((data[tuple_start + 31] != 0, data[data_start + 32:data_end]))
+    return decoded
+
+def rpc_payload(method: str, params: list) -> dict:
+    """Build a single JSON-RPC request"""
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": params,
+        "id": 1
+    }
+
+def decode_rpc_response(body: dict) -> Any:
+    """Extract the result of a single JSON-RPC response, raising on an error response"""
+    if "error" in body:
+        raise Exception(f"RPC error: {body['error']}")
+    return body.get("result")
+
+def rpc_batch_payload(calls: List[tuple]) -> List[dict]:
+    """Build a JSON-RPC array batch from (method, params) tuples, using list positions as ids"""
+    return [
+        {"jsonrpc": "2.0", "method": method, "params": params, "id": i}
+        for i, (method, params) in enumerate(calls)
+    ]
+
+def decode_rpc_batch_response(body: Any, count: int) -> List[Optional[Any]]:
+    """Map a JSON-RPC batch response back to request order.
+
+    Items with an error map to None, except header-not-found and refused
+    eth_getLogs ranges, which raise a RequestError of that kind.
+    """
+    if not isinstance(body, list):
+        # Providers that reject the whole batch answer with a single error object
+        error = body.get("error") if isinstance(body, dict) else body
+        raise Exception(f"RPC batch error: {error}")
+
+    results = [None] * count
+    for item in body:
+        item_id = item.get("id")
+        if not isinstance(item_id, int) or not 0 <= item_id < count:
+            continue
+        if "error" in item:
+            # A node behind the pinned block fails its items; retry the batch instead of reading None.
+            # A refused eth_getLogs range is raised too, so the caller can narrow it
+            kind = classify_error_message(str(item["error"]))
+            if kind in ("header_not_found", "log_range"):
+                raise RequestError(f"RPC batch error: {item['error']}", kind)
+            continue
+        results[item_id] = item.get("result")
+    return results
+
 @dataclass
 class SecurityCheckResult:
     title: str
@@ -138,198 +800,1802 @@ class SafeAnalysisResult:
     security_score: Optional[SecurityScore] = None
     checks: Optional[List[SecurityCheckResult]] = None
     error: Optional[str] = None
+    block_number: Optional[int] = None
     analyzed_at: str = None
+    retries: int = 0  # requests retried during this analysis
+
+class SqliteStore:
+    """Base of the stores kept in SQLite: connection setup and write buffering.
+
+    Rows are buffered in memory per table, not in an open transaction, and
+    written with one executemany per table and a commit every
+    SQLITE_COMMIT_INTERVAL rows, and by flush() or close(). Stores sharing a
+    database file thereby hold its write lock only while committing.
+    Subclasses list their tables' INSERT statements in INSERTS and create the
+    tables in _create_tables. Without a path nothing is written.
+    """
+
+    INSERTS: Dict[str, str] = {}  # table -> INSERT OR REPLACE statement for its rows
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, Dict[Any, tuple]] = {table: {} for table in self.INSERTS}
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._create_tables()
+            self._conn.commit()
+
+    def _create_tables(self):
+        raise NotImplementedError
+
+    def _buffer(self, table: str, key: Any, row: tuple):
+        """Queue a row for `table`, replacing a queued row with the same key. Call with the lock held"""
+        if not self._conn:
+            return
+        self._buffers[table][key] = row
+        if sum(len(rows) for rows in self._buffers.values()) >= SQLITE_COMMIT_INTERVAL:
+            self._commit()
+
+    def _buffered(self, table: str, key: Any) -> Optional[tuple]:
+        return self._buffers[table].get(key)
+
+    def _write_buffers(self):
+        for table, rows in self._buffers.items():
+            if rows:
+                self._conn.executemany(self.INSERTS[table], list(rows.values()))
+                rows.clear()
+
+    def _commit(self):
+        """Write the buffered rows in one transaction. Call with the lock held"""
+        if not self._conn:
+            return
+        self._write_buffers()
+        self._conn.commit()
+
+    def flush(self):
+        """Commit buffered writes"""
+        with self._lock:
+            self._commit()
+
+    def _entries(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            entries = self._entries()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            if self._conn:
+                self._commit()
+                self._conn.close()
+                self._conn = None
+
+class RpcCache(SqliteStore):
+    """Persistent SQLite cache of JSON-RPC responses.
+
+    Entries are keyed by chain id, method and params (which include the block
+    tag). Responses read at a block number at least RPC_CACHE_CONFIRMATIONS
+    below the chain head never expire. Responses read at newer blocks, which a
+    reorg could still replace, and at "latest" expire after `latest_ttl`
+    seconds. The head is learned from the eth_blockNumber responses passing
+    through the cache; until one is seen, no block counts as final. The cache holds at most
+    `max_entries` entries and evicts the least recently used ones beyond that.
+    Access times are written with the next commit, not on every hit.
+    """
+
+    INSERTS = {
+        "rpc_cache": "INSERT OR REPLACE INTO rpc_cache (key, chain_id, method, block, response, stored_at, accessed_at) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    }
+
+    # Methods whose response depends only on chain state at the requested block
+    CACHEABLE_METHODS = {
+        "eth_blockNumber",
+        "eth_chainId",
+        "eth_call",
+        "eth_getStorageAt",
+        "eth_getBalance",
+        "eth_getBlockByNumber",
+    }
+    # Block column values whose responses expire after the TTL: block tags (see
+    # _block_param; "pending" is never cached) and numbers not yet final
+    EXPIRING_BLOCK_TAGS = ("latest", "earliest", "safe", "finalized", "unfinalized")
+
+    def __init__(self, path: str, latest_ttl: float = RPC_CACHE_LATEST_TTL, max_entries: int = RPC_CACHE_MAX_ENTRIES):
+        self.latest_ttl = latest_ttl
+        self.max_entries = max_entries
+        self._touched: Dict[str, float] = {}  # key -> access time not yet written
+        self._heads: Dict[int, int] = {}  # chain id -> highest head seen
+        self._writes_since_purge = 0
+        super().__init__(path)
+        self._count = self._conn.execute("SELECT COUNT(*) FROM rpc_cache").fetchone()[0]
+
+    def _create_tables(self):
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rpc_cache (
+                key TEXT PRIMARY KEY,
+                chain_id INTEGER NOT NULL,
+                method TEXT NOT NULL,
+                block TEXT NOT NULL,
+                response TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rpc_cache_accessed ON rpc_cache (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rpc_cache_stored ON rpc_cache (block, stored_at)")
+
+    @staticmethod
+    def _block_param(method: str, params: list) -> Optional[str]:
+        """Extract the block tag a request reads at ("latest" when omitted)"""
+        if method == "eth_getBlockByNumber":
+            block = params[0] if params else "latest"
+        elif method in ("eth_blockNumber", "eth_chainId"):
+            block = "latest"
+        else:
+            block = params[-1] if params and isinstance(params[-1], str) else "latest"
+        return block.lower()
+
+    def _key(self, chain_id: int, method: str, params: list) -> Optional[tuple]:
+        """Return (key, block) for a cacheable request, or None"""
+        if method not in self.CACHEABLE_METHODS:
+            return None
+        block = self._block_param(method, params)
+        if block == "pending":
+            return None
+        # Hex data and addresses are case-insensitive, normalize them for the key
+        raw_key = json.dumps([chain_id, method, params], sort_keys=True, separators=(",", ":")).lower()
+        return hashlib.sha256(raw_key.encode()).hexdigest(), block
+
+    def get(self, chain_id: int, method: str, params: list) -> tuple:
+        """Look up a response. Returns (hit, result)"""
+        key = self._key(chain_id, method, params)
+        if key is None:
+            return False, None
+
+        now = time.time()
+        with self._lock:
+            pending = self._buffered("rpc_cache", key[0])
+            if pending is not None:
+                row = (pending[4], pending[5], pending[3])
+            else:
+                row = self._conn.execute(
+                    "SELECT response, stored_at, block FROM rpc_cache WHERE key = ?", (key[0],)
+                ).fetchone()
+            # Final blocks are immutable history, everything else gets the TTL
+            if row is None or (row[2] in self.EXPIRING_BLOCK_TAGS and row[1] + self.latest_ttl < now):
+                self.misses += 1
+                return False, None
+
+            # Written with the next commit rather than on every hit
+            self._touched[key[0]] = now
+            self.hits += 1
+            result = json.loads(row[0])
+            if method == "eth_blockNumber":
+                self._note_head(chain_id, result)
+            return True, result
+
+    def _note_head(self, chain_id: int, head: Any):
+        try:
+            head = int(head, 16)
+        except (TypeError, ValueError):
+            return
+        self._heads[chain_id] = max(head, self._heads.get(chain_id, head))
+
+    def _storage_block(self, chain_id: int, block: str) -> str:
+        """The block column for a response, with block numbers a reorg could still replace marked 'unfinalized'"""
+        if not block.startswith("0x"):
+            return block
+        head = self._heads.get(chain_id)
+        try:
+            final = head is not None and int(block, 16) <= head - RPC_CACHE_CONFIRMATIONS
+        except ValueError:
+            final = False
+        return block if final else "unfinalized"
+
+    def set(self, chain_id: int, method: str, params: list, result: Any):
+        """Store a response. Null results (e.g. unknown blocks) are not cached"""
+        key = self._key(chain_id, method, params)
+        if key is None or result is None:
+            return
+
+        cache_key, block = key
+        now = time.time()
+        with self._lock:
+            if method == "eth_blockNumber":
+                self._note_head(chain_id, result)
+            block = self._storage_block(chain_id, block)
+            self._touched.pop(cache_key, None)
+            # Replacements overcount; the count is corrected whenever it crosses the cap
+            self._count += 1
+            self._writes_since_purge += 1
+            self._buffer("rpc_cache", cache_key, (cache_key, chain_id, method, block, json.dumps(result), now, now))
+
+    def _purge_expired(self):
+        """Drop entries read at a block tag (not a number) that are past their TTL"""
+        self._writes_since_purge = 0
+        tags = ", ".join("?" * len(self.EXPIRING_BLOCK_TAGS))
+        deleted = self._conn.execute(
+            f"DELETE FROM rpc_cache WHERE block IN ({tags}) AND stored_at < ?",
+            (*self.EXPIRING_BLOCK_TAGS, time.time() - self.latest_ttl)
+        ).rowcount
+        self._count -= max(0, deleted)
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones until there is room again"""
+        self._purge_expired()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM rpc_cache").fetchone()[0]
+        if self._count > self.max_entries:
+            keep = int(self.max_entries * (1 - RPC_CACHE_EVICT_FRACTION))
+            self._conn.execute(
+                "DELETE FROM rpc_cache WHERE key IN (SELECT key FROM rpc_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (self._count - keep,)
+            )
+            self._count = keep
+
+    def _write_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE rpc_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _write_buffers(self):
+        # Access times and eviction go into the same transaction as the rows
+        super()._write_buffers()
+        self._write_touches()
+        if self._writes_since_purge >= RPC_CACHE_PURGE_INTERVAL:
+            self._purge_expired()
+        if self._count > self.max_entries:
+            self._evict()
+
+    def _entries(self) -> int:
+        self._commit()
+        return self._conn.execute("SELECT COUNT(*) FROM rpc_cache").fetchone()[0]
+
+@dataclass
+class CodeInfo:
+    code_hash: Optional[str]  # EVM codeHash (0x-prefixed keccak256 of the runtime bytecode), None when there is no code
+    size: int
+    kind: Optional[str] = None  # 'safe_proxy', 'module', 'guard', 'fallback_handler' or None if unknown
+    name: Optional[str] = None
+
+@dataclass
+class ContractCreation:
+    block_number: Optional[int]
+    timestamp: Optional[int]  # unix seconds of the creation block
+    creator: Optional[str] = None
+    tx_hash: Optional[str] = None
+
+class CodeCache(SqliteStore):
+    """Bytecode facts keyed by code hash instead of the bytecode itself.
+
+    For every (chain id, address, block) that was read only the code hash (the
+    EVM codeHash, as returned by extcodehash and explorers) and size are kept,
+    next to an index that classifies code hashes as a Safe
+    proxy, known module, known guard or fallback handler. Deployed code is
+    immutable, so code seen at a block is reused for any later block; an empty
+    account is only remembered for the exact block it was read at. Kept in
+    memory, and in SQLite too when a path is given.
+    """
+
+    INSERTS = {
+        "code_info": "INSERT OR REPLACE INTO code_info (chain_id, address, block, code_hash, size) VALUES (?, ?, ?, ?, ?)",
+        "code_index": "INSERT OR REPLACE INTO code_index (code_hash, kind, name) VALUES (?, ?, ?)",
+    }
+
+    def __init__(self, path: Optional[str] = None):
+        # (chain_id, address) -> list of (block, code_hash, size)
+        self._code: Dict[tuple, List[tuple]] = {}
+        # code_hash -> (kind, name)
+        self._index: Dict[str, tuple] = {}
+        super().__init__(path)
+        if self._conn:
+            for chain_id, address, block, code_hash, size in self._conn.execute(
+                "SELECT chain_id, address, block, code_hash, size FROM code_info"
+            ):
+                self._code.setdefault((chain_id, address), []).append((block, code_hash, size))
+            for code_hash, kind, name in self._conn.execute("SELECT code_hash, kind, name FROM code_index"):
+                self._index[code_hash] = (kind, name)
+
+    def _create_tables(self):
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS code_info (
+                chain_id INTEGER NOT NULL,
+                address TEXT NOT NULL,
+                block INTEGER NOT NULL,
+                code_hash TEXT,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (chain_id, address, block)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS code_index (
+                code_hash TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                name TEXT
+            )
+        """)
+        # Databases from before user_version 1 hold sha256 code hashes; drop what was derived from them
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            self._conn.execute("DELETE FROM code_info")
+            self._conn.execute("DELETE FROM code_index WHERE kind IN ('safe_proxy', 'fallback_handler')")
+            self._conn.execute("PRAGMA user_version = 1")
+
+    def get(self, chain_id: int, address: str, block: int) -> Optional[CodeInfo]:
+        """Look up the code of `address` at `block`, or None if it has to be read"""
+        with self._lock:
+            for seen_block, code_hash, size in self._code.get((chain_id, address.lower()), []):
+                if (size > 0 and seen_block <= block) or seen_block == block:
+                    self.hits += 1
+                    return self._info(code_hash, size)
+            self.misses += 1
+            return None
+
+    def inspect(self, address: str, code: Optional[str]) -> CodeInfo:
+        """Hash and classify bytecode read at `address` without recording it"""
+        code_hex = code[2:] if code and code.startswith("0x") else (code or "")
+        size = len(code_hex) // 2
+        code_hash = "0x" + keccak256(bytes.fromhex(code_hex)).hex() if size else None
+
+        with self._lock:
+            if code_hash and code_hash not in self._index:
+                handler_name = OFFICIAL_SAFE_FALLBACK_HANDLERS.get(address.lower())
+                if handler_name:
+                    self._register(code_hash, "fallback_handler", handler_name)
+                elif SAFE_PROXY_MASTER_COPY_SELECTOR in code_hex.lower() and size <= SAFE_PROXY_MAX_CODE_SIZE:
+                    self._register(code_hash, "safe_proxy", "Safe proxy")
+            return self._info(code_hash, size)
+
+    def put(self, chain_id: int, address: str, block: int, code: Optional[str]) -> CodeInfo:
+        """Record the code read at `address` at `block` and return its classified CodeInfo"""
+        info = self.inspect(address, code)
+        address = address.lower()
+        with self._lock:
+            self._code.setdefault((chain_id, address), []).append((block, info.code_hash, info.size))
+            self._buffer("code_info", (chain_id, address, block), (chain_id, address, block, info.code_hash, info.size))
+        return info
+
+    def register(self, code_hash: str, kind: str, name: Optional[str] = None):
+        """Classify a code hash, e.g. as a 'module' or 'guard' audited by your team"""
+        with self._lock:
+            self._register(code_hash, kind, name)
+
+    def _register(self, code_hash: str, kind: str, name: Optional[str]):
+        self._index[code_hash] = (kind, name)
+        self._buffer("code_index", code_hash, (code_hash, kind, name))
+
+    def classify(self, code_hash: Optional[str]) -> tuple:
+        """Return (kind, name) for a code hash, (None, None) when unknown"""
+        return self._index.get(code_hash, (None, None))
+
+    def _info(self, code_hash: Optional[str], size: int) -> CodeInfo:
+        kind, name = self._index.get(code_hash, (None, None))
+        return CodeInfo(code_hash=code_hash, size=size, kind=kind, name=name)
+
+    def _entries(self) -> int:
+        return sum(len(seen) for seen in self._code.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters, current size and number of classified code hashes"""
+        return dict(super().stats(), classified=len(self._index))
+
+# In-memory code cache shared by analyzers that are not given one
+DEFAULT_CODE_CACHE = CodeCache()
+
+class FactsStore(SqliteStore):
+    """Immutable per-(chain id, address) facts, such as how a contract was created.
+
+    A contract's creation block, timestamp, creator and creation transaction
+    never change, so entries never expire and are served before any network
+    call. Kept in memory, and in SQLite too when a path is given.
+    """
+
+    INSERTS = {
+        "contract_creation": "INSERT OR REPLACE INTO contract_creation "
+                             "(chain_id, address, block, timestamp, creator, tx_hash) VALUES (?, ?, ?, ?, ?, ?)",
+    }
+
+    def __init__(self, path: Optional[str] = None):
+        # (chain_id, address) -> ContractCreation
+        self._creations: Dict[tuple, ContractCreation] = {}
+        super().__init__(path)
+        if self._conn:
+            for chain_id, address, block, timestamp, creator, tx_hash in self._conn.execute(
+                "SELECT chain_id, address, block, timestamp, creator, tx_hash FROM contract_creation"
+            ):
+                self._creations[(chain_id, address)] = ContractCreation(block, timestamp, creator, tx_hash)
+
+    def _create_tables(self):
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS contract_creation (
+                chain_id INTEGER NOT NULL,
+                address TEXT NOT NULL,
+                block INTEGER,
+                timestamp INTEGER NOT NULL,
+                creator TEXT,
+                tx_hash TEXT,
+                PRIMARY KEY (chain_id, address)
+            )
+        """)
+
+    def get_creation(self, chain_id: int, address: str) -> Optional[ContractCreation]:
+        """Look up how `address` was created, or None if it has to be fetched"""
+        with self._lock:
+            creation = self._creations.get((chain_id, address.lower()))
+            if creation is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return creation
+
+    def put_creation(self, chain_id: int, address: str, creation: ContractCreation):
+        """Record a dated contract creation"""
+        address = address.lower()
+        with self._lock:
+            self._creations[(chain_id, address)] = creation
+            self._buffer("contract_creation", (chain_id, address), (
+                chain_id, address, creation.block_number, creation.timestamp, creation.creator, creation.tx_hash
+            ))
+
+    def _entries(self) -> int:
+        return len(self._creations)
+
+# In-memory facts store shared by analyzers that are not given one
+DEFAULT_FACTS_STORE = FactsStore()
+
+class AdaptiveRateLimiter:
+    """Per-endpoint token bucket with AIMD control of its rate and concurrency.
+
+    Every successful request raises the refill rate and the concurrency cap by a
+    small additive step; a throttled (429) or timed-out request cuts both by
+    RATE_LIMIT_DECREASE_FACTOR, at most once per cooldown. Throughput thereby
+    converges to the highest rate the provider accepts. Until the first
+    decrease the limiter is in slow start and grows both exponentially, so
+    highly concurrent callers reach the provider's limit quickly.
+    """
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float, concurrency: int, max_concurrency: int):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = float(concurrency)
+        self.max_concurrency = max_concurrency
+        self.tokens = 1.0
+        self.in_flight = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._slow_start = True
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token and a concurrency slot. Returns 0 on success, else seconds to wait before retrying"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(max(1.0, self.rate), self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self.in_flight >= int(self.concurrency):
+                return RATE_LIMIT_POLL_INTERVAL
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+
+            self.tokens -= 1
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def release(self, outcome: str):
+        """Return the slot taken by try_acquire. `outcome` is 'success', 'throttled', 'timeout', 'error' or 'cancelled'"""
+        with self._lock:
+            self.in_flight -= 1
+            if outcome == "success":
+                if self._slow_start:
+                    self.rate = min(self.max_rate, self.rate + 1)
+                    self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                else:
+                    self.rate = min(self.max_rate, self.rate + RATE_LIMIT_INCREASE / self.rate)
+                    self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+            elif outcome in ("throttled", "timeout"):
+                now = time.monotonic()
+                if now - self._last_decrease >= RATE_LIMIT_DECREASE_COOLDOWN:
+                    self._last_decrease = now
+                    self._slow_start = False
+                    self.rate = max(self.min_rate, self.rate * RATE_LIMIT_DECREASE_FACTOR)
+                    self.concurrency = max(1.0, self.concurrency * RATE_LIMIT_DECREASE_FACTOR)
+                    self.tokens = min(self.tokens, 0.0)
+
+_EXPLORER_LIMITERS: Dict[tuple, AdaptiveRateLimiter] = {}
+
+def get_explorer_limiter(url: str, api_key: Optional[str] = None) -> AdaptiveRateLimiter:
+    """Get the shared rate limiter for an explorer API endpoint and key.
+
+    Explorers rate limit per API key (Etherscan v2 across all chains), or per
+    client IP without one, so every key gets its own bucket.
+    """
+    limiter = _EXPLORER_LIMITERS.get((url, api_key))
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(**EXPLORER_RATE_LIMIT)
+        _EXPLORER_LIMITERS[(url, api_key)] = limiter
+    return limiter
+
+class ExplorerKeyPool:
+    """Explorer API keys of one endpoint, each paced by its own rate limiter.
+
+    Requests go to whichever key has a token and a free slot, starting the
+    search after the key used last, so a batch spreads over the combined quota
+    of all keys. A key that hits its daily limit is retired for the rest of the
+    run. Without keys the pool holds a single keyless entry.
+    """
+
+    def __init__(self, url: str, api_keys: List[str]):
+        self.url = url
+        self.keys: List[Optional[str]] = list(dict.fromkeys(key for key in api_keys if key)) or [None]
+        self.retired: set = set()
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> tuple:
+        """Take a slot on a ready key. Returns (key, 0.0), or (None, seconds to wait) when every key is busy"""
+        with self._lock:
+            active = [key for key in self.keys if key not in self.retired]
+            if not active:
+                raise RequestError("Every explorer API key has reached its daily limit", "fatal")
+            start = self._next % len(active)
+            shortest = None
+            for offset in range(len(active)):
+                index = (start + offset) % len(active)
+                key = active[index]
+                delay = get_explorer_limiter(self.url, key).try_acquire()
+                if delay <= 0:
+                    # Continue the rotation after the key actually used
+                    self._next = index + 1
+                    return key, 0.0
+                shortest = delay if shortest is None else min(shortest, delay)
+            return None, shortest
+
+    def acquire(self) -> Optional[str]:
+        """Block until some key may send. Returns that key"""
+        while True:
+            key, delay = self.try_acquire()
+            if delay <= 0:
+                return key
+            time.sleep(delay)
+
+    def release(self, key: Optional[str], outcome: str):
+        get_explorer_limiter(self.url, key).release(outcome)
+
+    def retire(self, key: Optional[str]):
+        """Stop using a key whose daily quota is spent"""
+        with self._lock:
+            if key not in self.retired:
+                self.retired.add(key)
+                print(f"🔑 Explorer API key {str(key)[:6]}... reached its daily limit, "
+                      f"{len(self.keys) - len(self.retired)} keys left")
+
+def is_rate_limited_response(body: Any) -> bool:
+    """Check a JSON-RPC or explorer response body for a rate-limit error"""
+    items = body if isinstance(body, list) else [body]
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        error = item.get("error")
+        if isinstance(error, dict):
+            message = str(error.get("message", ""))
+            # Some providers reuse -32005 for eth_getLogs result limits
+            if classify_error_message(message) == "log_range":
+                continue
+            if error.get("code") in (429, -32005) or "rate limit" in message.lower():
+                return True
+        # Etherscan-style: {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+        if item.get("status") == "0" and "rate limit" in str(item.get("result", "")).lower():
+            return True
+    return False
+
+def is_daily_limit_response(body: Any) -> bool:
+    """Check an explorer response for an exhausted daily quota ("Max daily rate limit reached")"""
+    return (isinstance(body, dict) and body.get("status") == "0"
+            and "daily" in str(body.get("result", "")).lower())
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections send TCP keep-alive probes.
+
+    Idle connections dropped by a load balancer are then detected by the OS
+    rather than surfacing as a failed request when they are next reused.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ])
+        super().init_poolmanager(*args, **kwargs)
+
+# Blocking sessions shared by every SafeAnalyzer (and its peers), keyed by host class
+_HTTP_SESSIONS: Dict[str, requests.Session] = {}
+_HTTP_POOL_SIZES: Dict[str, int] = {}
+_HTTP_SESSIONS_LOCK = threading.Lock()
+
+def get_http_session(host_class: str, pool_size: int) -> requests.Session:
+    """The shared session for a host class, with pools of at least `pool_size` connections per host.
+
+    Sharing one session per class keeps connections (and their TLS sessions)
+    alive across analyzers, and a pool at least as large as the number of
+    threads sending on it never has to discard a connection and reconnect.
+    """
+    with _HTTP_SESSIONS_LOCK:
+        session = _HTTP_SESSIONS.get(host_class)
+        if session is None:
+            session = requests.Session()
+            session.headers["Accept-Encoding"] = HTTP_ACCEPT_ENCODING
+            _HTTP_SESSIONS[host_class] = session
+        if _HTTP_POOL_SIZES.get(host_class, 0) < pool_size:
+            adapter = KeepAliveAdapter(pool_connections=TRANSPORT_POOL_HOSTS, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _HTTP_POOL_SIZES[host_class] = pool_size
+        return session
+
+def streams_json(content_length: Optional[str]) -> bool:
+    """Whether to parse a response body incrementally instead of buffering it whole.
+
+    Only with ijson's C backend (the pure-Python one is slower than buffering)
+    and only for bodies that are large or of unknown (chunked) size.
+    """
+    if ijson is None or not ijson.backend.startswith("yajl2"):
+        return False
+    return content_length is None or int(content_length) >= STREAM_JSON_MIN_BYTES
+
+def read_json_response(response: requests.Response) -> Any:
+    """Parse the JSON body of a response requested with stream=True.
+
+    Large bodies (batched calls, log and txlist pages) are decompressed and
+    parsed as they arrive, so the raw body is never held in memory whole.
+    """
+    if not streams_json(response.headers.get("Content-Length")):
+        return response.json()
+    response.raw.decode_content = True
+    for document in ijson.items(response.raw, "", use_float=True):
+        return document
+    raise ValueError("Empty JSON response")
+
+async def read_json_response_async(response: "aiohttp.ClientResponse") -> Any:
+    """read_json_response for aiohttp responses (decompressed by aiohttp as they stream)"""
+    if not streams_json(response.headers.get("Content-Length")):
+        return await response.json(content_type=None)
+    async for document in ijson.items_async(response.content, "", use_float=True):
+        return document
+    raise ValueError("Empty JSON response")
+
+class RequestError(Exception):
+    """A failed request, tagged with its error class (see classify_error)"""
+
+    def __init__(self, message: str, kind: str):
+        super().__init__(message)
+        self.kind = kind
+
+# Error classes worth retrying, in order of precedence when combining failures
+RETRYABLE_ERROR_KINDS = ("throttled", "header_not_found", "transient")
+RETRYABLE_HTTP_STATUSES = {408, 500, 502, 503, 504}
+
+def classify_error_message(message: str) -> Optional[str]:
+    """Classify an error by its text: provider error messages are the only signal for most of these"""
+    message = message.lower()
+    if "revert" in message:
+        return "revert"
+    if ("block range" in message or "range too large" in message or "is limited to" in message
+            or "query returned more than" in message or "response size exceeded" in message):
+        return "log_range"
+    if "rate limit" in message or "too many requests" in message:
+        return "throttled"
+    if "header not found" in message or "unknown block" in message or "block not found" in message:
+        return "header_not_found"
+    if "timed out" in message or "timeout" in message or "connection" in message:
+        return "transient"
+    return None
+
+def classify_error(error: BaseException) -> str:
+    """Classify a failed request.
+
+    'throttled' (429 or rate-limit body), 'header_not_found' (the node has not
+    seen the requested block yet), 'transient' (timeouts, connection errors,
+    408/500/502/503/504) are retried; 'revert' (deterministic execution revert),
+    'log_range' (an eth_getLogs range or result limit) and 'fatal' (anything
+    else) are not.
+    """
+    kind = getattr(error, "kind", None)
+    if kind:
+        return kind
+    status = getattr(getattr(error, "response", None), "status_code", None) or getattr(error, "status", None)
+    if status == 429:
+        return "throttled"
+    kind = classify_error_message(str(error))
+    if kind:
+        return kind
+    if isinstance(error, (requests.Timeout, ReadTimeoutError, requests.ConnectionError, asyncio.TimeoutError, ConnectionError)):
+        return "transient"
+    if aiohttp is not None and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return "transient"
+    if status in RETRYABLE_HTTP_STATUSES:
+        return "transient"
+    return "fatal"
+
+def request_outcome(error: BaseException) -> str:
+    """How a failed request ended for its rate limiter: 'cancelled', 'timeout', 'throttled' or 'error'"""
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"
+    if isinstance(error, (requests.Timeout, ReadTimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    return "throttled" if classify_error(error) == "throttled" else "error"
+
+def combine_errors(errors: List[BaseException]) -> RequestError:
+    """One RequestError for the failures of every endpoint, retryable if any of them was"""
+    kinds = [classify_error(error) for error in errors]
+    kind = next((kind for kind in RETRYABLE_ERROR_KINDS if kind in kinds), kinds[-1] if kinds else "fatal")
+    return RequestError(", ".join(str(error) for error in errors), kind)
+
+# Retries of the analysis running in the current context (a one-item list), see analyze_safe
+_RETRY_COUNTER: contextvars.ContextVar = contextvars.ContextVar("retry_counter", default=None)
+
+def next_retry_delay(error: BaseException, attempt: int, what: str) -> Optional[float]:
+    """Seconds to back off before retry number `attempt` + 1 of a failed request, None to give up.
+
+    Full jitter: a uniform delay up to RETRY_BASE_DELAY * 2^attempt, capped at
+    RETRY_MAX_DELAY, so clients throttled together do not retry together.
+    """
+    kind = classify_error(error)
+    if kind not in RETRYABLE_ERROR_KINDS or attempt >= RETRY_MAX_ATTEMPTS:
+        return None
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+    counter = _RETRY_COUNTER.get()
+    if counter is not None:
+        counter[0] += 1
+    print(f"🔁 Retrying {what} after {kind} error in {delay:.2f}s ({attempt + 1}/{RETRY_MAX_ATTEMPTS})")
+    return delay
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and the
+    endpoint is skipped. Once `cooldown` seconds have passed a single probe
+    request is let through (half-open): success closes the circuit, failure
+    opens it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                 cooldown: float = CIRCUIT_BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether a request could be sent now (does not reserve the half-open probe)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return time.monotonic() - self._opened_at >= self.cooldown
+            return not self._probe_in_flight
+
+    def before_request(self) -> bool:
+        """Claim permission to send a request, moving an expired open circuit to half-open"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def cancel_request(self):
+        """Give back a half-open probe whose request was cancelled before completing"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure. Returns True when this failure opened the circuit"""
+        with self._lock:
+            self.consecutive_failures += 1
+            was_open = self.state == self.OPEN
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+            return self.state == self.OPEN and not was_open
+
+class RpcEndpoint:
+    """One RPC endpoint with EWMA latency and error-rate scores"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.latencies = deque(maxlen=HEDGE_LATENCY_WINDOW)
+        self.limiter = AdaptiveRateLimiter(**RPC_RATE_LIMIT)
+        self.breaker = CircuitBreaker()
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return self.error_rate < ENDPOINT_UNHEALTHY_ERROR_RATE
+
+    def score(self) -> float:
+        """Expected cost of a request (lower is better). Unmeasured endpoints score 0 so they get measured"""
+        if self.ewma_latency is None and self.requests == 0:
+            return 0.0
+        latency = self.ewma_latency if self.ewma_latency is not None else ENDPOINT_UNMEASURED_LATENCY
+        return latency * (1 + 4 * self.error_rate)
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.requests += 1
+            self.latencies.append(latency)
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency += ENDPOINT_EWMA_ALPHA * (latency - self.ewma_latency)
+            self.error_rate *= 1 - ENDPOINT_EWMA_ALPHA
+        self.breaker.record_success()
+
+    def record_failure(self, trip_breaker: bool = True):
+        """Count a failed request. Throttled requests pass trip_breaker=False: the endpoint is alive"""
+        with self._lock:
+            self.requests += 1
+            self.error_rate += ENDPOINT_EWMA_ALPHA * (1 - self.error_rate)
+        if not trip_breaker:
+            self.breaker.record_success()
+        elif self.breaker.record_failure():
+            print(f"⚡ Circuit opened for RPC endpoint {self.url} after {self.breaker.consecutive_failures} failures")
+
+    def finish_request(self, outcome: str, latency: float):
+        """Record how a request admitted by the limiter and breaker ended (see request_outcome)"""
+        self.limiter.release(outcome)
+        if outcome == "success":
+            self.record_success(latency)
+        elif outcome == "cancelled":
+            # Lost a hedge race; says nothing about the endpoint's health
+            self.breaker.cancel_request()
+        else:
+            self.record_failure(trip_breaker=outcome != "throttled")
+
+
+class RpcEndpointPool:
+    """Pool of RPC endpoints for one chain, ranked by latency and error rate.
+
+    Requests go to the best-scoring healthy endpoint; a small share is routed
+    to a random endpoint so that scores of the others stay current. Pools, and
+    with them the endpoints' circuit breakers, are shared by every analyzer for
+    the same chain (see get_endpoint_pool).
+    """
+
+    def __init__(self, urls: List[str]):
+        self.endpoints: List[RpcEndpoint] = []
+        for url in urls:
+            self.add(url)
+
+    def add(self, url: str) -> RpcEndpoint:
+        """Add an endpoint, ignoring duplicates"""
+        for endpoint in self.endpoints:
+            if endpoint.url == url:
+                return endpoint
+        endpoint = RpcEndpoint(url)
+        self.endpoints.append(endpoint)
+        return endpoint
+
+    def ranked(self) -> List[RpcEndpoint]:
+        """Endpoints in the order they should be tried: healthy ones by score, then the rest.
+
+        Endpoints whose circuit breaker is open are left out.
+        """
+        available = [endpoint for endpoint in self.endpoints if endpoint.breaker.available()]
+        ranked = sorted(available, key=lambda e: (not e.healthy, e.score()))
+        if len(ranked) > 1 and random.random() < ENDPOINT_EXPLORE_PROBABILITY:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+        return ranked
+
+_ENDPOINT_POOLS: Dict[str, RpcEndpointPool] = {}
+
+def get_endpoint_pool(chain: str) -> RpcEndpointPool:
+    """Get the shared RPC endpoint pool for a chain"""
+    pool = _ENDPOINT_POOLS.get(chain)
+    if pool is None:
+        pool = RpcEndpointPool(SUPPORTED_CHAINS[chain]["rpc_urls"])
+        _ENDPOINT_POOLS[chain] = pool
+    return pool
+
+def add_rpc_endpoint(chain: str, url: str):
+    """Register an additional RPC endpoint for a chain"""
+    if chain not in SUPPORTED_CHAINS:
+        raise ValueError(f"Unsupported chain: {chain}. Supported: {list(SUPPORTED_CHAINS.keys())}")
+    get_endpoint_pool(chain).add(url)
+
+class SingleFlight:
+    """Coalesces identical in-flight RPC reads.
+
+    The first caller of a read becomes its leader and sends it; callers that
+    ask for the same method and params while it is in flight get the leader's
+    future and wait for its result instead of sending a duplicate. Futures are
+    concurrent.futures.Future so blocking threads and asyncio tasks (through
+    asyncio.wrap_future) can share them; asyncio followers wait through
+    asyncio.shield so a cancelled follower does not cancel the shared flight.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._flights: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(method: str, params: list) -> Optional[str]:
+        # Only reads of chain state are safe to share between callers
+        if method not in RpcCache.CACHEABLE_METHODS and method != "eth_getCode":
+            return None
+        return json.dumps([method, params], sort_keys=True, separators=(",", ":")).lower()
+
+    def join(self, method: str, params: list) -> tuple:
+        """Return (key, future, leader). The leader must call land() with the result"""
+        key = self._key(method, params)
+        if key is None:
+            return None, None, True
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return key, flight, False
+            flight = Future()
+            self._flights[key] = flight
+            return key, flight, True
+
+    def land(self, key: Optional[str], result: Any):
+        """Publish a leader's result to its waiting callers"""
+        if key is None:
+            return
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        # A cancelled flight has no one left to tell
+        if flight is not None and not flight.cancelled():
+            flight.set_result(result)
+
+_SINGLE_FLIGHTS: Dict[str, SingleFlight] = {}
+
+def get_single_flight(chain: str) -> SingleFlight:
+    """Get the shared in-flight request table for a chain"""
+    flights = _SINGLE_FLIGHTS.get(chain)
+    if flights is None:
+        flights = SingleFlight()
+        _SINGLE_FLIGHTS[chain] = flights
+    return flights
 
 class SafeAnalyzer:
-    def __init__(self, chain: str, api_key: str = None, timeout: int = 30):
+    """Blocking Safe analyzer.
+
+    Analysis logic is written as generator "steps" (the `_*_steps` methods) that
+    yield I/O requests as tuples, e.g. ("rpc_call", method, params), and receive
+    the results. SafeAnalyzer executes them with blocking requests sessions;
+    AsyncSafeAnalyzer executes the same steps on asyncio, so both engines share
+    one implementation of every check.
+    """
+
+    def __init__(self, chain: str, api_key: Union[str, List[str], None] = None, timeout: int = 30,
+                 cache: Optional[RpcCache] = None, hedge: bool = False, hedge_percentile: float = HEDGE_PERCENTILE,
+                 code_cache: Optional[CodeCache] = None, pool_size: Optional[int] = None,
+                 facts: Optional[FactsStore] = None, last_activity: str = "auto"):
         if chain not in SUPPORTED_CHAINS:
             raise ValueError(f"Unsupported chain: {chain}. Supported: {list(SUPPORTED_CHAINS.keys())}")
+        if last_activity not in LAST_ACTIVITY_SOURCES:
+            raise ValueError(f"Unsupported last activity source: {last_activity}. Supported: {list(LAST_ACTIVITY_SOURCES)}")
 
         self.chain = chain
         self.chain_config = SUPPORTED_CHAINS[chain]
-        self.api_key = api_key
+        # One key or several; explorer requests are spread over all of them
+        self.api_keys = [api_key] if isinstance(api_key, str) else list(api_key or [])
+        self.api_key = self.api_keys[0] if self.api_keys else None
+        self.explorer_keys = ExplorerKeyPool(self.chain_config["explorer_api"], self.api_keys)
         self.timeout = timeout
-        self.session = requests.Session()
+        self.cache = cache
+        self.code_cache = code_cache if code_cache is not None else DEFAULT_CODE_CACHE
+        self.facts = facts if facts is not None else DEFAULT_FACTS_STORE
+        # Where check 6 dates the last transaction: execution logs ("rpc"),
+        # explorer txlist ("explorer"), or logs with txlist as fallback ("auto")
+        self.last_activity = last_activity
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        # Explorer connections: every key can have its limiter's maximum in flight
+        self.explorer_pool_size = TRANSPORT_POOL_SIZES["explorer"] * len(self.explorer_keys.keys)
+        # RPC connections per host: one per thread that can send (the caller plus hedge workers)
+        self.pool_size = pool_size or (1 + HEDGE_MAX_WORKERS if hedge else 1)
+        self.sessions = {
+            "rpc": get_http_session("rpc", self.pool_size),
+            "explorer": get_http_session("explorer", self.explorer_pool_size),
+            "github": get_http_session("github", TRANSPORT_POOL_SIZES["github"]),
+        }
+        self.endpoint_pool = get_endpoint_pool(chain)
+        self.single_flight = get_single_flight(chain)
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.multicall3_address = self.chain_config.get("multicall3_address")
+        self._prefetched_safe_data: Dict[str, Dict[str, Any]] = {}
+        self._prefetched_owners: Dict[str, tuple] = {}  # address -> (PackedAddresses, index)
+        self._prefetched_modules: Dict[str, tuple] = {}  # address -> (PackedAddresses, index)
+        self._creations: Dict[str, Optional[ContractCreation]] = {}  # None: explorer had no answer
+        self._block_timestamps: Dict[int, int] = {}
+        self._last_activity: Dict[str, Optional[int]] = {}  # timestamp of the last execution; None: not found
+        self._inactive_since: Dict[str, int] = {}  # timestamp the scan reached, beyond the threshold, without a hit
+        self._peer_analyzers: Dict[str, "SafeAnalyzer"] = {}
+        self.block_number: Optional[int] = None
+        self._latest_safe_versions: Optional[tuple] = None
 
         print(f"🔗 Initialized Safe Analyzer for {self.chain_config['name']}")
 
-    def rpc_call(self, method: str, params: list) -> dict:
-        """Make JSON-RPC call to blockchain with backup RPC support"""
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params,
-            "id": 1
-        }
-
-        # Try primary RPC first
+    def _run(self, steps: Generator) -> Any:
+        """Run analysis steps, executing each I/O request they yield with the blocking transport"""
+        result, error = None, None
+        while True:
+            try:
+                request = steps.throw(error) if error else steps.send(result)
+            except StopIteration as done:
+                return done.value
+            result, error = None, None
+            try:
+                result = self._execute(request)
+            except Exception as e:
+                error = e
+
+    def _execute(self, request: tuple) -> Any:
+        """Execute one I/O request yielded by analysis steps.
+
+        ("run_on", analyzer, steps) runs nested steps on another analyzer and
+        ("gather", [(analyzer, steps), ...]) runs several (one after another
+        here, concurrently on the async engine). Any other request names a
+        transport method and its arguments.
+        """
+        op, *args = request
+        if op == "run_on":
+            analyzer, steps = args
+            return analyzer._run(steps)
+        if op == "gather":
+            return [analyzer._run(steps) for analyzer, steps in args[0]]
+        return getattr(self, op)(*args)
+
+    @property
+    def block_tag(self) -> str:
+        """Block parameter for reads: the pinned block, or "latest" when unpinned"""
+        return hex(self.block_number) if self.block_number is not None else "latest"
+
+    def pin_block(self, block_number: Optional[int] = None) -> Optional[int]:
+        """Pin all subsequent reads to one block (the current head by default).
+
+        Pinning keeps every read of an analysis consistent and makes the
+        responses reproducible. If the head cannot be resolved, reads stay on
+        "latest".
+        """
+        return self._run(self._pin_block_steps(block_number))
+
+    def _pin_block_steps(self, block_number: Optional[int] = None) -> Generator:
+        # Read the head for an explicit block too: the cache keeps reads at a
+        # block permanently only once the block is final
+        if block_number is None or self.cache:
+            head = yield ("rpc_call", "eth_blockNumber", [])
+            if block_number is None:
+                block_number = int(head, 16) if head else None
+        if block_number != self.block_number:
+            self._forget_block_state()
+        self.block_number = block_number
+        return block_number
+
+    def unpin_block(self):
+        """Release the pinned block, including the pins of other-chain analyzers"""
+        self.block_number = None
+        self._forget_block_state()
+        for peer in self._peer_analyzers.values():
+            peer.unpin_block()
+
+    def _forget_block_state(self):
+        """Drop prefetched reads that only hold at the block they were made at"""
+        self._prefetched_safe_data.clear()
+        self._prefetched_owners.clear()
+        self._prefetched_modules.clear()
+        self._last_activity.clear()
+        self._inactive_since.clear()
+
+    def _create_peer(self, chain: str) -> "SafeAnalyzer":
+        return SafeAnalyzer(chain, timeout=self.timeout, cache=self.cache,
+                            hedge=self.hedge, hedge_percentile=self.hedge_percentile,
+                            code_cache=self.code_cache, pool_size=self.pool_size, facts=self.facts)
+
+    def _peer_analyzer_steps(self, chain: str) -> Generator:
+        """Get the analyzer used to read another chain.
+
+        Peers are kept for the lifetime of this analyzer and pinned to their own
+        chain head once per pin of this analyzer (per analysis, or once per batch).
+        """
+        peer = self._peer_analyzers.get(chain)
+        if peer is None:
+            peer = self._create_peer(chain)
+            self._peer_analyzers[chain] = peer
+        if self.block_number is not None and peer.block_number is None:
+            yield ("pin_peer", peer)
+        return peer
+
+    def pin_peer(self, peer: "SafeAnalyzer") -> Optional[int]:
+        """Pin another-chain analyzer to its current head"""
+        return peer.pin_block()
+
+    def _post_rpc(self, endpoint: RpcEndpoint, payload: Union[dict, list]) -> Any:
+        """POST a JSON-RPC payload (single request or array batch) and return the decoded body"""
+        if not endpoint.breaker.before_request():
+            raise Exception(f"Circuit open for RPC endpoint {endpoint.url}")
+        endpoint.limiter.acquire()
+        outcome = "success"
+        started = time.monotonic()
         try:
-            response = self.session.post(
-                self.chain_config["rpc_url"],
+            with self.sessions["rpc"].post(
+                endpoint.url,
                 json=payload,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            result = response.json()
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                body = read_json_response(response)
+            if is_rate_limited_response(body):
+                raise RequestError(f"RPC rate limited by {endpoint.url}", "throttled")
+        except Exception as e:
+            outcome = request_outcome(e)
+            raise
+        finally:
+            endpoint.finish_request(outcome, time.monotonic() - started)
+        return body
+
+    def _hedge_delay(self, endpoint: RpcEndpoint) -> float:
+        """Seconds to wait on an endpoint before hedging: the configured percentile of its recent latencies"""
+        samples = sorted(endpoint.latencies)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        index = min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))
+        return min(self.timeout, max(HEDGE_MIN_DELAY, samples[index]))
+
+    def _rpc_endpoints(self) -> List[RpcEndpoint]:
+        """Endpoints to try in one round, best first"""
+        endpoints = self.endpoint_pool.ranked()
+        if not endpoints:
+            raise RequestError("No RPC endpoint available, all circuits are open", "fatal")
+        return endpoints
+
+    def _should_hedge(self, endpoints: List[RpcEndpoint]) -> bool:
+        return self.hedge and len(endpoints) > 1
+
+    def _collect_endpoint_error(self, error: Exception, errors: List[Exception]):
+        """Keep an endpoint's failure for combine_errors, or raise it if it is a revert: every endpoint would revert the same way"""
+        if classify_error(error) == "revert":
+            raise error
+        errors.append(error)
+
+    def _rpc_retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Backoff before retrying a round in which every endpoint failed, None to give up"""
+        return next_retry_delay(error, attempt, f"RPC request on {self.chain_config['name']}")
+
+    def _send_rpc(self, payload: Union[dict, list], decode) -> Any:
+        """Send a payload to the best RPC endpoint, failing over to (or hedging with) the next ones.
+
+        `decode` turns the response body into the result and raises if the body
+        is an error. When every endpoint failed with a retryable error (see
+        classify_error) the whole round is retried with backoff; a revert fails
+        at once. Raises if no endpoint produced a result.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._send_rpc_once(payload, decode)
+            except Exception as e:
+                delay = self._rpc_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    def _send_rpc_once(self, payload: Union[dict, list], decode) -> Any:
+        endpoints = self._rpc_endpoints()
+        if self._should_hedge(endpoints):
+            return self._send_hedged(endpoints, payload, decode)
+
+        errors = []
+        for i, endpoint in enumerate(endpoints):
+            try:
+                return decode(self._post_rpc(endpoint, payload))
+            except Exception as e:
+                self._collect_endpoint_error(e, errors)
+                if i < len(endpoints) - 1:
+                    print(f"RPC endpoint {endpoint.url} failed for {self.chain_config['name']}, trying next endpoint")
+
+        raise combine_errors(errors)
+
+    def _send_hedged(self, endpoints: List[RpcEndpoint], payload: Union[dict, list], decode) -> Any:
+        """Send to the best endpoint and, if it is slower than usual, race the same request on the next one.
+
+        The hedge request fires once the current endpoint has been pending longer
+        than the hedge percentile of its recent latencies (or immediately when it
+        fails). The first successful response wins. Losing requests that have not
+        started yet are cancelled; ones already on the wire are abandoned and
+        their responses discarded.
+        """
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="rpc-hedge")
+
+        def attempt(endpoint: RpcEndpoint):
+            return decode(self._post_rpc(endpoint, payload))
+
+        remaining = list(endpoints)
+        first = remaining.pop(0)
+        pending = {self._hedge_executor.submit(attempt, first)}
+        done, _ = wait(pending, timeout=self._hedge_delay(first))
+        if not done:
+            pending.add(self._hedge_executor.submit(attempt, remaining.pop(0)))
+
+        errors = []
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        self._collect_endpoint_error(e, errors)
+                if remaining and not pending:
+                    # Nothing left in flight, go to the next endpoint right away
+                    pending.add(self._hedge_executor.submit(attempt, remaining.pop(0)))
+        finally:
+            for loser in pending:
+                loser.cancel()
+
+        raise combine_errors(errors)
+
+    def close(self):
+        """Shut down the hedge worker threads, also those of other-chain analyzers"""
+        self._shutdown_hedge_executor()
+        for peer in self._peer_analyzers.values():
+            peer.close()
+
+    def _shutdown_hedge_executor(self):
+        # Abandoned hedge requests still on the wire are not waited for
+        executor, self._hedge_executor = self._hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "SafeAnalyzer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
-            if "error" in result:
-                raise Exception(f"RPC error: {result['error']}")
-            return result.get("result")
-        except Exception as primary_error:
-            print(f"Primary RPC failed for {self.chain_config['name']}, trying backup RPC")
+    def rpc_call(self, method: str, params: list) -> dict:
+        """Make JSON-RPC call to blockchain through the chain's endpoint pool.
 
-            # Try backup RPC
-            try:
-                response = self.session.post(
-                    self.chain_config["backup_rpc_url"],
-                    json=payload,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                result = response.json()
+        A read identical to one already in flight waits for that request's
+        result instead of being sent again.
+        """
+        hit, cached = self._cache_get(method, params)
+        if hit:
+            return cached
 
-                if "error" in result:
-                    raise Exception(f"RPC error: {result['error']}")
-                return result.get("result")
-            except Exception as backup_error:
-                print(f"Both primary and backup RPC failed for {self.chain_config['name']}: {primary_error}, {backup_error}")
-                return None
+        key, flight, leader = self.single_flight.join(method, params)
+        if not leader:
+            return flight.result()
 
-    def explorer_api_call(self, params: dict) -> dict:
-        """Make API call to blockchain explorer"""
-        # Add chainid for V2 API
+        result = None
+        try:
+            result = self._send_rpc(rpc_payload(method, params), decode_rpc_response)
+            self._cache_set(method, params, result)
+        except Exception as e:
+            if classify_error(e) != "revert":
+                print(f"All RPC endpoints failed for {self.chain_config['name']}: {e}")
+        finally:
+            self.single_flight.land(key, result)
+        return result
+
+    def _cache_get(self, method: str, params: list) -> tuple:
+        if not self.cache:
+            return False, None
+        return self.cache.get(self.chain_config["chain_id"], method, params)
+
+    def _cache_set(self, method: str, params: list, result: Any):
+        if self.cache and result is not None:
+            self.cache.set(self.chain_config["chain_id"], method, params, result)
+
+    def rpc_batch(self, calls: List[tuple]) -> List[Optional[Any]]:
+        """Make a JSON-RPC array batch call through the chain's endpoint pool.
+
+        `calls` is a list of (method, params) tuples. All of them are sent in a
+        single POST and the response items are mapped back by id, so the returned
+        list lines up with `calls`. Items that come back with an error (e.g. a
+        revert on a getter the contract does not implement) map to None without
+        affecting the rest of the batch; only transport-level failures fail over
+        to the next endpoint. An eth_getLogs range or result limit refused by
+        every endpoint is raised as a 'log_range' RequestError. Calls already in flight elsewhere are not sent
+        again; their results are taken from the requests in flight.
+        """
+        results, missing = self._cache_lookup_batch(calls)
+        if not missing:
+            return results
+
+        leading, following = self._join_flights(calls, missing)
+        if leading:
+            self._cache_store_batch(calls, results, leading, self._send_batch_leading(calls, leading))
+        for i, flight in following.items():
+            results[i] = flight.result()
+        return results
+
+    def _join_flights(self, calls: List[tuple], missing: List[int]) -> tuple:
+        """Split missing batch calls into (indexes to send, {index: in-flight future to wait on})"""
+        leading, following = [], {}
+        for i in missing:
+            key, flight, leader = self.single_flight.join(*calls[i])
+            if leader:
+                leading.append((i, key))
+            else:
+                following[i] = flight
+        return leading, following
+
+    def _send_batch_leading(self, calls: List[tuple], leading: List[tuple]) -> list:
+        leading_calls = [calls[i] for i, _ in leading]
+        fetched = [None] * len(leading_calls)
+        try:
+            fetched = self._send_rpc(
+                rpc_batch_payload(leading_calls),
+                lambda body: decode_rpc_batch_response(body, len(leading_calls))
+            )
+        except Exception as e:
+            if classify_error(e) == "log_range":
+                raise
+            print(f"All RPC endpoints failed a batch for {self.chain_config['name']}: {e}")
+        finally:
+            for (_, key), result in zip(leading, fetched):
+                self.single_flight.land(key, result)
+        return fetched
+
+    def _cache_lookup_batch(self, calls: List[tuple]) -> tuple:
+        """Serve batch calls from the cache. Returns (results, indexes of the calls still to send)"""
+        results = [None] * len(calls)
+        missing = []
+        for i, (method, params) in enumerate(calls):
+            hit, cached = self._cache_get(method, params)
+            if hit:
+                results[i] = cached
+            else:
+                missing.append(i)
+        return results, missing
+
+    def _cache_store_batch(self, calls: List[tuple], results: list, sent: List[tuple], fetched: list) -> list:
+        """Merge fetched results for the sent (index, flight key) calls into `results` and cache them"""
+        for (i, _), result in zip(sent, fetched):
+            results[i] = result
+            self._cache_set(calls[i][0], calls[i][1], result)
+        return results
+
+    def multicall(self, calls: List[tuple]) -> Optional[List[Optional[memoryview]]]:
+        """Execute (target, call_data) calls in one Multicall3 aggregate3 eth_call.
+
+        Returns one entry per call holding its return data as bytes, or None for calls
+        that reverted or returned nothing. Returns None as a whole when Multicall3
+        is not configured or not deployed on this chain, so callers can fall back
+        to per-call reads.
+        """
+        return self._run(self._multicall_steps(calls))
+
+    def _multicall_steps(self, calls: List[tuple]) -> Generator:
+        request = self._multicall_request(calls)
+        if request is None:
+            return None
+
+        result = yield ("rpc_call", *request)
+        return self._decode_multicall(result, len(calls))
+
+    def _multicall_request(self, calls: List[tuple]) -> Optional[tuple]:
+        """The (method, params) of the aggregate3 eth_call for `calls`, or None without Multicall3"""
+        if not calls or not self.multicall3_address:
+            return None
+        return ("eth_call", [{
+            "to": self.multicall3_address,
+            "data": encode_aggregate3(calls)
+        }, self.block_tag])
+
+    def _decode_multicall(self, result: Optional[str], call_count: int) -> Optional[List[Optional[memoryview]]]:
+        """Decode an aggregate3 response as returned by multicall()"""
+        if result is None:
+            return None
+        if result == "0x":
+            # Nothing deployed at the Multicall3 address, don't try again
+            print(f"Multicall3 not available on {self.chain_config['name']}, using per-call reads")
+            self.multicall3_address = None
+            return None
+
+        try:
+            decoded = decode_aggregate3(result)
+        except Exception as e:
+            print(f"Could not decode Multicall3 response: {e}")
+            return None
+        if len(decoded) != call_count:
+            return None
+
+        return [
+            return_data if success and len(return_data) else None
+            for success, return_data in decoded
+        ]
+
+    def _explorer_params(self, params: dict) -> dict:
+        # Add chainid for V2 API; the API key is chosen per request by the key pool
         params["chainid"] = self.chain_config["chain_id"]
+        return params
+
+    def _explorer_throttled(self, key: Optional[str], result: Any) -> Optional[RequestError]:
+        """The error for a rate-limited explorer response, retiring the key if its daily quota is spent"""
+        if is_daily_limit_response(result):
+            self.explorer_keys.retire(key)
+        elif not is_rate_limited_response(result):
+            return None
+        return RequestError(f"Explorer rate limited: {result.get('result')}", "throttled")
 
-        if self.api_key:
-            params["apikey"] = self.api_key
+    def explorer_api_call(self, params: dict) -> dict:
+        """Make API call to blockchain explorer, retrying throttled and transient failures with backoff"""
+        params = self._explorer_params(params)
 
+        attempt = 0
+        while True:
+            try:
+                return self._explorer_get(params)
+            except Exception as e:
+                delay = next_retry_delay(e, attempt, "explorer API call")
+                if delay is None:
+                    print(f"Explorer API call failed: {e}")
+                    return {"status": "0", "message": str(e)}
+                time.sleep(delay)
+                attempt += 1
+
+    def _explorer_get(self, params: dict) -> dict:
+        key = self.explorer_keys.acquire()
+        if key:
+            params = dict(params, apikey=key)
+        outcome = "error"
         try:
-            response = self.session.get(
+            with self.sessions["explorer"].get(
                 self.chain_config["explorer_api"],
                 params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"Explorer API call failed: {e}")
-            return {"status": "0", "message": str(e)}
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                if response.status_code == 429:
+                    outcome = "throttled"
+                response.raise_for_status()
+                result = read_json_response(response)
+            throttled = self._explorer_throttled(key, result)
+            if throttled:
+                outcome = "throttled"
+                raise throttled
+            outcome = "success"
+            return result
+        except (requests.Timeout, ReadTimeoutError):  # the latter while streaming the body
+            outcome = "timeout"
+            raise
+        finally:
+            self.explorer_keys.release(key, outcome)
+
+    def http_get_json(self, url: str) -> Any:
+        """GET a JSON document (e.g. from the GitHub API)"""
+        response = self.sessions["github"].get(
+            url,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_code_info(self, address: str) -> Optional[CodeInfo]:
+        """Get the code hash, size and classification of an address (None if the read failed)"""
+        return self._run(self._code_info_steps(address))
+
+    def _code_info_steps(self, address: str) -> Generator:
+        # Only reads at a pinned block can be keyed by block
+        if self.block_number is not None:
+            info = self.code_cache.get(self.chain_config["chain_id"], address, self.block_number)
+            if info is not None:
+                return info
+
+        code = yield ("rpc_call", "eth_getCode", [address, self.block_tag])
+        if code is None:
+            return None
+        if self.block_number is None:
+            return self.code_cache.inspect(address, code)
+        return self.code_cache.put(self.chain_config["chain_id"], address, self.block_number, code)
 
     def is_contract(self, address: str) -> bool:
         """Check if address is a contract"""
-        code = self.rpc_call("eth_getCode", [address, "latest"])
-        return code is not None and code != "0x" and len(code) > 2
+        return self._run(self._is_contract_steps(address))
+
+    def _is_contract_steps(self, address: str) -> Generator:
+        info = yield from self._code_info_steps(address)
+        return info is not None and info.size > 0
 
     def get_safe_data(self, address: str) -> Dict[str, Any]:
         """Get basic Safe contract data using multicall"""
+        return self._run(self._get_safe_data_steps(address))
+
+    def _get_safe_data_steps(self, address: str) -> Generator:
+        prefetched = self._prefetched_safe_data.get(address.lower())
+        if prefetched is not None:
+            safe_data = dict(prefetched)
+            packed = self._prefetched_owners.get(address.lower())
+            if packed is not None:
+                owners, index = packed
+                safe_data["owners"] = owners.addresses(index)
+            packed = self._prefetched_modules.get(address.lower())
+            if packed is not None:
+                safe_data["modules"] = _packed_modules(*packed)
+            return safe_data
+
         try:
-            # Prepare multicall for all Safe functions
-            calls = []
-            function_sigs = {
-                "VERSION": "0xffa1ad74",
-                "getThreshold": "0xe75235b8",
-                "getOwners": "0xa0e67e2b",
-                "nonce": "0xaffed0e0",
-                "getModulesPaginated": "0xcc2f8452000000000000000000000000000000000000000000000000000000000000000100000000000000000000000000000000000000000000000000000000000000000a",
-                "getGuard": "0xa2926596",
-                "getFallbackHandler": "0xf08a0323"
-            }
+            results = yield from self._safe_reads_steps([address])
+            return self._parse_safe_results(results[0] if results and results[0] is not None else {})
+
+        except Exception as e:
+            print(f"Error getting Safe data: {e}")
+            return {}
 
-            results = {}
+    def prefetch_safe_data(self, addresses: List[str], chunk_size: int = MULTICALL_CHUNK_SIZE) -> int:
+        """Prefetch Safe getter and storage slot data for many addresses ahead of analysis.
+
+        The getter calls of all addresses are packed into Multicall3 chunks of at
+        most `chunk_size` calls (whole Safes per chunk), so a batch of N Safes
+        costs roughly N * len(SAFE_FUNCTION_SIGS) / chunk_size requests instead
+        of one request per Safe. Each chunk's storage slot reads travel in the
+        same JSON-RPC batch. Decoded results are served by get_safe_data.
+        Returns the number of addresses that were prefetched.
+        """
+        return self._run(self._prefetch_safe_data_steps(addresses, chunk_size))
+
+    def _safe_reads_steps(self, addresses: List[str]) -> Generator:
+        """Read the Safe getters and storage slots of `addresses` in one round trip.
+
+        The getters go into one Multicall3 aggregate3 eth_call and the storage
+        slots are eth_getStorageAt reads in the same JSON-RPC batch. Without
+        Multicall3 the getters are individual eth_calls in that batch instead.
+        Returns one dict of raw return data (bytes) keyed by getter or slot
+        name per address, or None if the reads failed at the transport level.
+        An address whose return data does not decode gets None instead of a dict.
+        The module list is walked to its end and returned decoded under "modules".
+        """
+        getter_calls = [(address, sig) for address in addresses for sig in SAFE_FUNCTION_SIGS.values()]
+        storage_reads = [
+            ("eth_getStorageAt", [address, slot, self.block_tag])
+            for address in addresses for slot in SAFE_STORAGE_SLOTS.values()
+        ]
+
+        getter_results = None
+        storage_results = None
+        multicall_request = self._multicall_request(getter_calls)
+        if multicall_request is not None:
+            batch_results = yield ("rpc_batch", [multicall_request] + storage_reads)
+            getter_results = self._decode_multicall(batch_results[0], len(getter_calls))
+            storage_results = batch_results[1:]
+
+        if getter_results is None:
+            individual_calls = [
+                ("eth_call", [{"to": target, "data": data}, self.block_tag])
+                for target, data in getter_calls
+            ]
+            if storage_results is None:
+                batch_results = yield ("rpc_batch", individual_calls + storage_reads)
+                storage_results = batch_results[len(individual_calls):]
+                batch_results = batch_results[:len(individual_calls)]
+            else:
+                batch_results = yield ("rpc_batch", individual_calls)
+            getter_results = batch_results
+
+        if all(result is None for result in getter_results + storage_results):
+            return None
 
-            # Call each function individually (multicall can be complex)
-            for func_name, sig in function_sigs.items():
-                if func_name == "getModulesPaginated":
-                    # Special handling for modules
-                    result = self.rpc_call("eth_call", [{
-                        "to": address,
-                        "data": sig
-                    }, "latest"])
+        per_safe = []
+        for i in range(len(addresses)):
+            safe_getters = getter_results[i * len(SAFE_FUNCTION_SIGS):(i + 1) * len(SAFE_FUNCTION_SIGS)]
+            safe_slots = storage_results[i * len(SAFE_STORAGE_SLOTS):(i + 1) * len(SAFE_STORAGE_SLOTS)]
+            try:
+                # Multicall return data is already bytes, individual eth_call and storage results are hex
+                raw = [
+                    (name, hex_to_bytes(result) if isinstance(result, str) else result)
+                    for name, result in list(zip(SAFE_FUNCTION_SIGS, safe_getters)) + list(zip(SAFE_STORAGE_SLOTS, safe_slots))
+                ]
+            except ValueError as e:
+                print(f"Could not decode Safe data of {addresses[i]}: {e}")
+                per_safe.append(None)
+                continue
+            per_safe.append({name: result for name, result in raw if result})
+
+        yield from self._walk_modules_steps(addresses, per_safe)
+        return per_safe
+
+    def _walk_modules_steps(self, addresses: List[str], per_safe: List[Dict[str, Any]]) -> Generator:
+        """Follow the getModulesPaginated cursor of every Safe until its module list ends.
+
+        Decodes the first page in each results dict into results["modules"]
+        (in one vectorized pass for large batches). In a vectorized batch, a list
+        that ends on its first page is left packed as (PackedAddresses, index)
+        until get_safe_data hands it out.
+        Safes whose list continues get their next pages in rounds of one
+        multicall (or JSON-RPC batch) for all of them, so walking long lists
+        costs one round trip per page depth, not per Safe.
+        """
+        first_pages = [results.pop("getModulesPaginated", None) if results is not None else None for results in per_safe]
+        packed = None
+        if len(first_pages) >= BULK_DECODE_MIN_PAYLOADS:
+            packed = bulk_decode_address_arrays(first_pages)
+
+        cursors = {}
+        for i, (results, first_page) in enumerate(zip(per_safe, first_pages)):
+            if first_page is None:
+                continue
+            try:
+                if packed is not None and packed.valid[i]:
+                    next_module = _abi_address(first_page, 32)
+                    if next_module in (SENTINEL_MODULES, ZERO_ADDRESS):
+                        results["modules"] = (packed, i)
+                        continue
+                    modules = _packed_modules(packed, i)
                 else:
-                    result = self.rpc_call("eth_call", [{
-                        "to": address,
-                        "data": sig
-                    }, "latest"])
-
-                if result and result != "0x":
-                    results[func_name] = result
-
-            # Parse results
-            safe_data = {}
-
-            # Parse VERSION
-            if "VERSION" in results:
-                # Remove 0x and decode string
-                hex_data = results["VERSION"][2:]
-                if len(hex_data) >= 128:  # Standard ABI encoding
-                    # Skip offset (64 chars) and length (64 chars), get string
-                    string_start = 128
-                    string_length = int(hex_data[64:128], 16) * 2
-                    if len(hex_data) >= string_start + string_length:
-                        version_hex = hex_data[string_start:string_start + string_length]
-                        safe_data["version"] = bytes.fromhex(version_hex).decode('utf-8').strip('\x00')
-
-            # Parse threshold
-            if "getThreshold" in results:
-                safe_data["threshold"] = int(results["getThreshold"], 16)
-
-            # Parse nonce
-            if "nonce" in results:
-                safe_data["nonce"] = int(results["nonce"], 16)
-
-            # Parse owners (more complex ABI decoding needed)
-            if "getOwners" in results:
-                hex_data = results["getOwners"][2:]
-                if len(hex_data) >= 128:
-                    # Parse dynamic array
-                    array_length = int(hex_data[64:128], 16)
-                    owners = []
-                    for i in range(array_length):
-                        offset = 128 + (i * 64)
-                        if len(hex_data) >= offset + 64:
-                            owner_hex = hex_data[offset + 24:offset + 64]  # Remove padding
-                            owners.append("0x" + owner_hex)
-                    safe_data["owners"] = owners
-
-            # Parse modules
-            if "getModulesPaginated" in results:
-                hex_data = results["getModulesPaginated"][2:]
-                if len(hex_data) >= 128:
-                    # Parse the first array (modules)
-                    array_offset = int(hex_data[0:64], 16) * 2
-                    if len(hex_data) > array_offset + 64:
-                        array_length = int(hex_data[array_offset:array_offset + 64], 16)
-                        modules = []
-                        for i in range(array_length):
-                            module_offset = array_offset + 64 + (i * 64)
-                            if len(hex_data) >= module_offset + 64:
-                                module_hex = hex_data[module_offset + 24:module_offset + 64]
-                                module_addr = "0x" + module_hex
-                                if module_addr != "0x0000000000000000000000000000000000000001":  # Skip sentinel
-                                    modules.append(module_addr)
-                        safe_data["modules"] = modules
-
-            # Parse getGuard
-            if "getGuard" in results:
-                hex_data = results["getGuard"][2:]
-                if hex_data and hex_data != "0" * 64:  # Check if not empty or zero address
-                    guard_addr = "0x" + hex_data[-40:]  # Last 40 chars (20 bytes)
-                    if guard_addr != "0x0000000000000000000000000000000000000000":
-                        safe_data["guard"] = guard_addr
-
-            # Parse getFallbackHandler
-            if "getFallbackHandler" in results:
-                hex_data = results["getFallbackHandler"][2:]
-                if hex_data and hex_data != "0" * 64:  # Check if not empty or zero address
-                    handler_addr = "0x" + hex_data[-40:]  # Last 40 chars (20 bytes)
-                    if handler_addr != "0x0000000000000000000000000000000000000000":
-                        safe_data["fallback_handler"] = handler_addr
+                    modules, next_module = decode_modules_page(first_page)
+            except (ValueError, IndexError):
+                continue
+            results["modules"] = modules
+            if next_module not in (SENTINEL_MODULES, ZERO_ADDRESS):
+                cursors[i] = next_module
+
+        for _ in range(MODULE_MAX_PAGES):
+            if not cursors:
+                return
+            for i, next_module in cursors.items():
+                # Safe < 1.4.0 returns the first module not on the page as `next`
+                # and starts the following page after it; 1.4.x returns the last
+                # module of the page. Collect it either way.
+                if next_module not in per_safe[i]["modules"]:
+                    per_safe[i]["modules"].append(next_module)
+
+            order = list(cursors)
+            calls = [(addresses[i], encode_modules_paginated(cursors[i], MODULE_PAGE_SIZE)) for i in order]
+            page_results = yield from self._multicall_steps(calls)
+            if page_results is None:
+                page_results = yield ("rpc_batch", [
+                    ("eth_call", [{"to": target, "data": data}, self.block_tag])
+                    for target, data in calls
+                ])
+                page_results = [hex_to_bytes(result) for result in page_results]
+
+            next_cursors = {}
+            for i, result in zip(order, page_results):
+                if not result:
+                    continue
+                try:
+                    modules, next_module = decode_modules_page(result)
+                except (ValueError, IndexError):
+                    continue
+                collected = per_safe[i]["modules"]
+                new_modules = [module for module in modules if module not in collected]
+                collected.extend(new_modules)
+                if next_module in (SENTINEL_MODULES, ZERO_ADDRESS):
+                    continue
+                if new_modules or next_module not in collected:
+                    next_cursors[i] = next_module
+            cursors = next_cursors
+
+        if cursors:
+            print(f"Module list still not exhausted after {MODULE_MAX_PAGES} pages, stopping")
+
+    def _prefetch_safe_data_steps(self, addresses: List[str], chunk_size: int = MULTICALL_CHUNK_SIZE) -> Generator:
+        pending = []
+        seen = set()
+        for address in addresses:
+            key = address.lower()
+            if re.match(r'^0x[a-fA-F0-9]{40}$', address) and key not in seen:
+                seen.add(key)
+                pending.append(address)
+
+        safes_per_chunk = max(1, chunk_size // len(SAFE_FUNCTION_SIGS))
+        prefetched = 0
+        requests_made = 0
+
+        for chunk_start in range(0, len(pending), safes_per_chunk):
+            chunk = pending[chunk_start:chunk_start + safes_per_chunk]
+            chunk_results = yield from self._safe_reads_steps(chunk)
+            requests_made += 1
+            if chunk_results is None:
+                # Transport failure, leave these to the per-Safe path
+                continue
 
-            return safe_data
+            # Owner lists of the whole chunk are decoded in one pass and kept
+            # packed until get_safe_data hands them out
+            owners = bulk_decode_address_arrays([
+                results.get("getOwners") if results is not None else None for results in chunk_results
+            ])
+            for i, (address, results) in enumerate(zip(chunk, chunk_results)):
+                if results is None:
+                    # Undecodable return data, leave this Safe to the per-Safe path
+                    continue
+                try:
+                    if owners.valid[i]:
+                        results = dict(results)
+                        del results["getOwners"]
+                        self._prefetched_owners[address.lower()] = (owners, i)
+                    if isinstance(results.get("modules"), tuple):
+                        results = dict(results)
+                        self._prefetched_modules[address.lower()] = results.pop("modules")
+                    self._prefetched_safe_data[address.lower()] = self._parse_safe_results(results)
+                    prefetched += 1
+                except Exception as e:
+                    print(f"Error decoding prefetched Safe data for {address}: {e}")
+
+        print(f"📦 Prefetched Safe data for {prefetched}/{len(pending)} addresses in {requests_made} requests")
+        return prefetched
+
+    def _parse_safe_results(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode raw getter and storage slot data (as returned by _safe_reads_steps) into Safe data.
+
+        A getter whose return data does not decode (e.g. a non-Safe contract
+        answering the selector) is left out.
+        """
+        safe_data = {}
+
+        for func_name, field, decoder in SAFE_GETTER_FIELDS:
+            data = results.get(func_name)
+            if data is not None:
+                try:
+                    safe_data[field] = decoder(data, 0)
+                except (ValueError, UnicodeDecodeError):
+                    continue
+        if "version" in safe_data:
+            safe_data["version"] = safe_data["version"].strip("\x00")
 
-        except Exception as e:
-            print(f"Error getting Safe data: {e}")
-            return {}
+        # Modules, already walked to the end of the list by _walk_modules_steps
+        if "modules" in results:
+            modules = results["modules"]
+            safe_data["modules"] = _packed_modules(*modules) if isinstance(modules, tuple) else modules
+
+        # Parse guard and fallback handler storage slots (address in the low 20 bytes)
+        for slot_name in SAFE_STORAGE_SLOTS:
+            if slot_name in results:
+                slot_addr = _abi_address(bytes(results[slot_name]).rjust(32, b"\0"), 0)
+                if slot_addr != ZERO_ADDRESS:
+                    safe_data[slot_name] = slot_addr
+
+        return safe_data
 
     def _check_transaction_guard(self, safe_data: dict) -> SecurityCheckResult:
         """Check if Safe has a transaction guard enabled"""
@@ -388,7 +2654,35 @@ class SafeAnalyzer:
                 }
             )
 
-    def _check_multichain_deployment(self, address: str, current_safe_data: dict) -> SecurityCheckResult:
+    def _other_chain_deployment_steps(self, chain_name: str, address: str) -> Generator:
+        """Look up `address` on another chain. Returns (deployed, owners)"""
+        try:
+            # Analyzer for the other chain, pinned to that chain's head
+            temp_analyzer = yield from self._peer_analyzer_steps(chain_name)
+
+            # Check if contract exists on this chain, from the code cache when seen before
+            code_info = yield ("run_on", temp_analyzer, temp_analyzer._code_info_steps(address))
+            if code_info is None or code_info.size == 0:
+                return False, None
+            if code_info.kind in ("module", "guard", "fallback_handler"):
+                # Known non-Safe code at the same address
+                return False, None
+
+            # Try to get owners to confirm it's a Safe
+            try:
+                safe_data = yield ("run_on", temp_analyzer, temp_analyzer._get_safe_data_steps(address))
+                if "owners" in safe_data:
+                    return True, safe_data["owners"]
+                return False, None
+            except Exception:
+                # If we can get code but not Safe data, still count as deployed
+                return True, None
+
+        except Exception as e:
+            print(f"Error checking {SUPPORTED_CHAINS[chain_name]['name']}: {e}")
+            return False, None
+
+    def _check_multichain_deployment_steps(self, address: str, current_safe_data: dict) -> Generator:
         """Check if Safe is deployed across multiple chains and analyze signer reuse"""
         deployed_chains = []
         signer_reuse = {}
@@ -403,41 +2697,31 @@ class SafeAnalyzer:
                     signer_reuse[owner_lower] = []
                 signer_reuse[owner_lower].append(self.chain_config["name"])
 
-        # Check other chains
-        for chain_name, chain_config in SUPPORTED_CHAINS.items():
-            if chain_name.lower() == self.chain_config["name"].lower():
-                continue  # Skip current chain
-
-            try:
-                # Create temporary analyzer for other chain
-                temp_analyzer = SafeAnalyzer(chain_name)
-
-                # Check if contract exists on this chain
-                code = temp_analyzer.rpc_call("eth_getCode", [address, "latest"])
-                if not code or code == "0x":
-                    continue
-
-                # Try to get owners to confirm it's a Safe
-                try:
-                    safe_data = temp_analyzer.get_safe_data(address)
-                    if "owners" in safe_data:
-                        deployed_chains.append(chain_config["name"])
-                        chain_owners = safe_data["owners"]
-                        all_chain_owners[chain_config["name"]] = chain_owners
-
-                        # Track signer reuse
-                        for owner in chain_owners:
-                            owner_lower = owner.lower()
-                            if owner_lower not in signer_reuse:
-                                signer_reuse[owner_lower] = []
-                            signer_reuse[owner_lower].append(chain_config["name"])
-                except Exception:
-                    # If we can get code but not Safe data, still count as deployed
-                    deployed_chains.append(chain_config["name"])
-
-            except Exception as e:
-                print(f"Error checking {chain_config['name']}: {e}")
+        # Check other chains (concurrently on the async engine)
+        other_chains = [
+            chain_name for chain_name in SUPPORTED_CHAINS
+            if chain_name.lower() != self.chain_config["name"].lower()  # Skip current chain
+        ]
+        deployments = yield ("gather", [
+            (self, self._other_chain_deployment_steps(chain_name, address))
+            for chain_name in other_chains
+        ])
+
+        for chain_name, (deployed, chain_owners) in zip(other_chains, deployments):
+            if not deployed:
+                continue
+            chain_config = SUPPORTED_CHAINS[chain_name]
+            deployed_chains.append(chain_config["name"])
+            if chain_owners is None:
                 continue
+            all_chain_owners[chain_config["name"]] = chain_owners
+
+            # Track signer reuse
+            for owner in chain_owners:
+                owner_lower = owner.lower()
+                if owner_lower not in signer_reuse:
+                    signer_reuse[owner_lower] = []
+                signer_reuse[owner_lower].append(chain_config["name"])
 
         # Add current chain to deployed list
         deployed_chains.insert(0, self.chain_config["name"])
@@ -482,19 +2766,222 @@ class SafeAnalyzer:
 
     def get_contract_creation_date(self, address: str) -> Optional[datetime]:
         """Get contract creation date from explorer API"""
+        return self._run(self._get_contract_creation_date_steps(address))
+
+    def prefetch_contract_creations(self, addresses: List[str]) -> int:
+        """Resolve the creation of many contracts ahead of analysis.
+
+        Addresses go to the explorer's getcontractcreation action
+        CONTRACT_CREATION_BATCH_SIZE at a time, and the creation blocks the
+        explorer did not date are timestamped in one JSON-RPC batch. Contracts
+        the explorer could not resolve are located by a binary search over
+        historical code (see _search_creation_blocks_steps). Addresses
+        already known not to be Safes are skipped. Results are served by
+        get_contract_creation_date. Returns the number of creations resolved.
+        """
+        return self._run(self._prefetch_contract_creations_steps(addresses))
+
+    def _prefetch_contract_creations_steps(self, addresses: List[str]) -> Generator:
+        pending = []
+        seen = set()
+        for address in addresses:
+            key = address.lower()
+            if not re.match(r'^0x[a-fA-F0-9]{40}$', address) or key in seen or key in self._creations:
+                continue
+            seen.add(key)
+            prefetched = self._prefetched_safe_data.get(key)
+            if prefetched is not None and "version" not in prefetched:
+                continue
+            pending.append(address)
+        if not pending:
+            return 0
+
+        requests_made, search_rounds = yield from self._resolve_contract_creations_steps(pending)
+        resolved = sum(self._creations.get(address.lower()) is not None for address in pending)
+        searched = f" and {search_rounds} eth_getCode search rounds" if search_rounds else ""
+        print(f"🏗️ Resolved contract creation for {resolved}/{len(pending)} addresses "
+              f"in {requests_made} explorer requests{searched}")
+        return resolved
+
+    def _resolve_contract_creations_steps(self, addresses: List[str]) -> Generator:
+        """Look up and date the creation of `addresses`, recording None for those left unresolved.
+
+        Creations in the facts store are served from it. The rest come from
+        the explorer, or from historical code when the explorer has no answer
+        (or is down), and are stored once dated. Returns the number of
+        explorer requests and of code search rounds made.
+        """
+        chain_id = self.chain_config["chain_id"]
+        unknown = []
+        for address in addresses:
+            creation = self.facts.get_creation(chain_id, address)
+            if creation is not None:
+                self._creations[address.lower()] = creation
+            else:
+                unknown.append(address)
+        if not unknown:
+            return 0, 0
+
+        batches = yield ("gather", [
+            (self, self._contract_creation_batch_steps(unknown[i:i + CONTRACT_CREATION_BATCH_SIZE]))
+            for i in range(0, len(unknown), CONTRACT_CREATION_BATCH_SIZE)
+        ])
+        creations = {}
+        for batch in batches:
+            creations.update(batch)
+        yield from self._date_creations_steps(list(creations.values()))
+
+        unresolved = [
+            address for address in unknown
+            if creations.get(address.lower()) is None or creations[address.lower()].timestamp is None
+        ]
+        search_rounds = 0
+        if unresolved:
+            blocks, search_rounds = yield from self._search_creation_blocks_steps(unresolved)
+            searched = {key: ContractCreation(block_number=block, timestamp=None) for key, block in blocks.items()}
+            yield from self._date_creations_steps(list(searched.values()))
+            creations.update(searched)
+
+        for address in unknown:
+            creation = creations.get(address.lower())
+            if creation is None or creation.timestamp is None:
+                self._creations[address.lower()] = None
+                continue
+            self._creations[address.lower()] = creation
+            self.facts.put_creation(chain_id, address, creation)
+        return len(batches), search_rounds
+
+    def _search_creation_blocks_steps(self, addresses: List[str]) -> Generator:
+        """Find the deployment block of contracts by binary search over historical eth_getCode.
+
+        Every round reads the code of each address still being searched at the
+        middle of its remaining range, in JSON-RPC batches of at most
+        MULTICALL_CHUNK_SIZE reads, so any number of addresses take about
+        log2(head) rounds. Needs an archive endpoint;
+        an address whose historical read fails drops out of the search, as
+        does one without code at the pinned block (or the head). Returns
+        ({address: creation block}, rounds made).
+        """
+        head = self.block_number
+        if head is None:
+            latest = yield ("rpc_call", "eth_blockNumber", [])
+            if latest is None:
+                return {}, 0
+            head = int(latest, 16)
+
+        # No code at `low` (-1: before genesis), code at `high` (head + 1: not found yet)
+        ranges = {address.lower(): (-1, head + 1) for address in addresses}
+        rounds = 0
+        while True:
+            probes = [(key, (low + high) // 2) for key, (low, high) in ranges.items() if high - low > 1]
+            if not probes:
+                break
+            codes = yield from self._chunked_batch_steps([("eth_getCode", [key, hex(block)]) for key, block in probes])
+            rounds += 1
+            for (key, block), code in zip(probes, codes):
+                if code is None:
+                    del ranges[key]
+                    continue
+                low, high = ranges[key]
+                ranges[key] = (low, block) if code not in ("", "0x") else (block, high)
+
+        return {key: high for key, (low, high) in ranges.items() if high <= head}, rounds
+
+    def _chunked_batch_steps(self, calls: List[tuple]) -> Generator:
+        """rpc_batch for any number of calls, sent as batches of at most MULTICALL_CHUNK_SIZE (concurrently on async)"""
+        if len(calls) <= MULTICALL_CHUNK_SIZE:
+            return (yield ("rpc_batch", calls))
+        chunks = yield ("gather", [
+            (self, self._batch_steps(calls[i:i + MULTICALL_CHUNK_SIZE]))
+            for i in range(0, len(calls), MULTICALL_CHUNK_SIZE)
+        ])
+        return [result for chunk in chunks for result in chunk]
+
+    def _batch_steps(self, calls: List[tuple]) -> Generator:
+        return (yield ("rpc_batch", calls))
+
+    def _contract_creation_batch_steps(self, addresses: List[str]) -> Generator:
+        """One getcontractcreation call for up to CONTRACT_CREATION_BATCH_SIZE addresses"""
+        result = yield ("explorer_api_call", {
+            "module": "contract",
+            "action": "getcontractcreation",
+            "contractaddresses": ",".join(addresses)
+        })
+
+        creations = {}
+        if result.get("status") != "1" or not isinstance(result.get("result"), list):
+            return creations
+        for entry in result["result"]:
+            try:
+                # Older explorer responses carry only the creator and transaction hash
+                block_number = entry.get("blockNumber")
+                timestamp = entry.get("timestamp")
+                creations[entry["contractAddress"].lower()] = ContractCreation(
+                    block_number=int(block_number) if block_number else None,
+                    timestamp=int(timestamp) if timestamp else None,
+                    creator=entry.get("contractCreator"),
+                    tx_hash=entry.get("txHash")
+                )
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        return creations
+
+    def _date_creations_steps(self, creations: List[ContractCreation]) -> Generator:
+        """Fill in the missing creation blocks and timestamps from the chain, one round of batches per step"""
+        undated = [
+            creation for creation in creations
+            if creation.timestamp is None and creation.block_number is None and creation.tx_hash
+        ]
+        if undated:
+            transactions = yield from self._chunked_batch_steps([
+                ("eth_getTransactionByHash", [creation.tx_hash]) for creation in undated
+            ])
+            for creation, transaction in zip(undated, transactions):
+                if isinstance(transaction, dict) and transaction.get("blockNumber"):
+                    creation.block_number = int(transaction["blockNumber"], 16)
+
+        timestamps = yield from self._block_timestamps_steps([
+            creation.block_number for creation in creations
+            if creation.timestamp is None and creation.block_number is not None
+        ])
+        for creation in creations:
+            if creation.timestamp is None:
+                creation.timestamp = timestamps.get(creation.block_number)
+
+    def _block_timestamps_steps(self, block_numbers: List[int]) -> Generator:
+        """Timestamps of blocks, read in bounded JSON-RPC batches and remembered by the analyzer"""
+        missing = sorted({number for number in block_numbers if number not in self._block_timestamps})
+        if missing:
+            blocks = yield from self._chunked_batch_steps([
+                ("eth_getBlockByNumber", [hex(number), False]) for number in missing
+            ])
+            for number, block in zip(missing, blocks):
+                if isinstance(block, dict) and block.get("timestamp"):
+                    self._block_timestamps[number] = int(block["timestamp"], 16)
+        return {number: self._block_timestamps[number] for number in block_numbers if number in self._block_timestamps}
+
+    def _get_contract_creation_date_steps(self, address: str) -> Generator:
         try:
+            # getcontractcreation and the code search, unless a batch lookup already tried this address
+            if address.lower() not in self._creations:
+                yield from self._resolve_contract_creations_steps([address])
+            creation = self._creations.get(address.lower())
+            if creation is not None:
+                return datetime.fromtimestamp(creation.timestamp)
+
+            # Neither the explorer nor the code search found it, use the timestamp of the first transaction
             params = {
                 "module": "account",
                 "action": "txlist",
                 "address": address,
                 "startblock": "0",
-                "endblock": "99999999",
+                "endblock": str(self.block_number) if self.block_number is not None else "99999999",
                 "sort": "asc",
                 "page": "1",
                 "offset": "1"
             }
 
-            result = self.explorer_api_call(params)
+            result = yield ("explorer_api_call", params)
 
             if result.get("status") == "1" and result.get("result"):
                 first_tx = result["result"][0]
@@ -508,19 +2995,187 @@ class SafeAnalyzer:
 
     def get_last_transaction_date(self, address: str) -> Optional[datetime]:
         """Get last transaction date from explorer API"""
+        return self._run(self._get_last_transaction_date_steps(address))
+
+    def prefetch_last_activity(self, addresses: List[str]) -> int:
+        """Find the last execution of many Safes in their logs ahead of analysis.
+
+        One backwards scan covers the whole batch (see _scan_executions_steps).
+        Addresses already known not to be Safes, or to have never executed
+        (nonce 0), are skipped. Results are served by get_last_transaction_date.
+        Returns the number of Safes whose last execution was found.
+        """
+        return self._run(self._prefetch_last_activity_steps(addresses))
+
+    def _prefetch_last_activity_steps(self, addresses: List[str]) -> Generator:
+        if self.last_activity == "explorer":
+            return 0
+
+        pending = []
+        seen = set()
+        for address in addresses:
+            key = address.lower()
+            if not re.match(r'^0x[a-fA-F0-9]{40}$', address) or key in seen or key in self._last_activity:
+                continue
+            seen.add(key)
+            prefetched = self._prefetched_safe_data.get(key)
+            if prefetched is not None and ("version" not in prefetched or prefetched.get("nonce") == 0):
+                continue
+            pending.append(address)
+        if not pending:
+            return 0
+
+        requests_made = yield from self._resolve_last_activity_steps(pending)
+        found = sum(self._last_activity.get(address.lower()) is not None for address in pending)
+        inactive = sum(address.lower() in self._inactive_since for address in pending)
+        message = f"🕒 Found last execution of {found}/{len(pending)} Safes in {requests_made} eth_getLogs requests"
+        if inactive:
+            message += f", {inactive} inactive for {INACTIVITY_ERROR_DAYS}+ days"
+        print(message)
+        return found
+
+    def _resolve_last_activity_steps(self, addresses: List[str]) -> Generator:
+        """Scan for the last execution of `addresses` and date it. Returns the number of requests made"""
+        blocks, inactive, requests_made = yield from self._scan_executions_steps(addresses)
+        timestamps = yield from self._block_timestamps_steps(list(blocks.values()))
+        for address in addresses:
+            self._last_activity[address.lower()] = timestamps.get(blocks.get(address.lower()))
+            self._inactive_since.pop(address.lower(), None)
+        self._inactive_since.update(inactive)
+        return requests_made
+
+    def _scan_executions_steps(self, addresses: List[str]) -> Generator:
+        """Find the block of the latest ExecutionSuccess/ExecutionFailure log of each Safe.
+
+        Windows of blocks are scanned backwards from the pinned block (or the
+        head), starting at LOG_SCAN_INITIAL_WINDOW blocks and doubling up to
+        LOG_SCAN_MAX_WINDOW. Every window is a JSON-RPC batch of eth_getLogs
+        filters over arrays of Safe addresses, plus the header of its oldest
+        block; batches carry at most LOG_SCAN_MAX_FILTERS_PER_REQUEST filters,
+        so a window needing more is sent as several. A Safe leaves the scan at
+        its first hit, or once the scan passes its creation block (when known).
+        When the node refuses a filter (range or result limits) the block range
+        per filter is halved and the window is split into several filters of
+        that range. Other failures, already retried by the transport, end the
+        scan. The scan also ends once a window reaches back
+        INACTIVITY_ERROR_DAYS: older executions don't change the verdict.
+
+        Returns ({address: block}, {address: timestamp}, requests made): the
+        block of each Safe's last execution, and for Safes without one since the
+        threshold, the timestamp the scan reached. Other Safes are left out.
+        """
+        head = self.block_number
+        if head is None:
+            latest = yield ("rpc_call", "eth_blockNumber", [])
+            if latest is None:
+                return {}, {}, 1
+            head = int(latest, 16)
+
+        pending = {}
+        for address in addresses:
+            creation = self._creations.get(address.lower())
+            floor = creation.block_number if creation is not None and creation.block_number is not None else 0
+            pending[address.lower()] = floor
+
+        threshold = time.time() - INACTIVITY_ERROR_DAYS * 86400
+        found = {}
+        inactive = {}
+        requests_made = 0
+        to_block = head
+        window = LOG_SCAN_INITIAL_WINDOW
+        max_range = LOG_SCAN_MAX_WINDOW  # widest block range the node accepted in one filter
+        while pending and to_block >= 0 and requests_made < LOG_SCAN_MAX_REQUESTS:
+            keys = list(pending)
+            groups = [keys[i:i + LOG_SCAN_ADDRESSES_PER_FILTER] for i in range(0, len(keys), LOG_SCAN_ADDRESSES_PER_FILTER)]
+            window = min(window, max_range * max(1, LOG_SCAN_MAX_FILTERS_PER_REQUEST // len(groups)))
+            from_block = max(0, to_block - window + 1)
+            ranges = [(max(from_block, end - max_range + 1), end) for end in range(to_block, from_block - 1, -max_range)]
+            calls = [
+                ("eth_getLogs", [{
+                    "address": group,
+                    "topics": [SAFE_EXECUTION_TOPICS],
+                    "fromBlock": hex(start),
+                    "toBlock": hex(end)
+                }])
+                for start, end in ranges
+                for group in groups
+            ]
+            batches = [calls[i:i + LOG_SCAN_MAX_FILTERS_PER_REQUEST]
+                       for i in range(0, len(calls), LOG_SCAN_MAX_FILTERS_PER_REQUEST)]
+            batches[-1] = batches[-1] + [("eth_getBlockByNumber", [hex(from_block), False])]
+            results = []
+            try:
+                for batch in batches:
+                    requests_made += 1
+                    results.extend((yield ("rpc_batch", batch)))
+            except RequestError as e:
+                if classify_error(e) != "log_range":
+                    raise
+                widest = min(window, max_range)
+                if widest <= LOG_SCAN_MIN_WINDOW:
+                    print(f"eth_getLogs keeps failing at {widest} blocks, leaving {len(pending)} Safes unscanned")
+                    break
+                # Don't grow back into a range this node refused
+                max_range = max(LOG_SCAN_MIN_WINDOW, widest // 2)
+                continue
+            oldest = results.pop()
+            if any(not isinstance(logs, list) for logs in results):
+                print(f"eth_getLogs failed, leaving {len(pending)} Safes unscanned")
+                break
+
+            for logs in results:
+                for log in logs:
+                    key = str(log.get("address", "")).lower()
+                    if key not in pending or log.get("removed"):
+                        continue
+                    try:
+                        block = int(log["blockNumber"], 16)
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    found[key] = max(found.get(key, block), block)
+
+            for key, floor in list(pending.items()):
+                if key in found or floor >= from_block:
+                    del pending[key]
+            to_block = from_block - 1
+            window = min(LOG_SCAN_MAX_WINDOW, window * 2)
+
+            if isinstance(oldest, dict) and oldest.get("timestamp"):
+                self._block_timestamps[from_block] = int(oldest["timestamp"], 16)
+                if self._block_timestamps[from_block] <= threshold:
+                    for key in pending:
+                        inactive[key] = self._block_timestamps[from_block]
+                    break
+
+        return found, inactive, requests_made
+
+    def _get_last_transaction_date_steps(self, address: str) -> Generator:
         try:
+            if self.last_activity != "explorer":
+                # Execution logs first, unless a batch scan at this pin already covered this Safe
+                if address.lower() not in self._last_activity or self.block_number is None:
+                    yield from self._resolve_last_activity_steps([address])
+                timestamp = self._last_activity.get(address.lower())
+                if timestamp is not None:
+                    return datetime.fromtimestamp(timestamp)
+                # Past the threshold the scan has settled the verdict: txlist would date
+                # the latest transfer *to* the Safe, which anyone can send
+                if self.last_activity == "rpc" or address.lower() in self._inactive_since:
+                    return None
+
+            # Fall back to the latest transaction sent to the Safe
             params = {
                 "module": "account",
                 "action": "txlist",
                 "address": address,
                 "startblock": "0",
-                "endblock": "99999999",
+                "endblock": str(self.block_number) if self.block_number is not None else "99999999",
                 "sort": "desc",
                 "page": "1",
                 "offset": "1"
             }
 
-            result = self.explorer_api_call(params)
+            result = yield ("explorer_api_call", params)
 
             if result.get("status") == "1" and result.get("result"):
                 last_tx = result["result"][0]
@@ -534,13 +3189,15 @@ class SafeAnalyzer:
 
     def get_latest_safe_version(self) -> tuple[Optional[str], Optional[str]]:
         """Get latest Safe version from GitHub API"""
+        return self._run(self._get_latest_safe_version_steps())
+
+    def _get_latest_safe_version_steps(self) -> Generator:
+        # The release list is the same for every Safe, fetch it once per analyzer
+        if self._latest_safe_versions is not None:
+            return self._latest_safe_versions
+
         try:
-            response = self.session.get(
-                "https://api.github.com/repos/safe-global/safe-smart-account/releases",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            releases = response.json()
+            releases = yield ("http_get_json", "https://api.github.com/repos/safe-global/safe-smart-account/releases")
 
             if not releases:
                 return None, None
@@ -558,7 +3215,8 @@ class SafeAnalyzer:
                         second_latest_version = version
                         break
 
-            return latest_version, second_latest_version
+            self._latest_safe_versions = (latest_version, second_latest_version)
+            return self._latest_safe_versions
 
         except Exception as e:
             print(f"Error fetching latest Safe version: {e}")
@@ -639,6 +3297,9 @@ class SafeAnalyzer:
 
     def perform_security_checks(self, address: str, safe_data: Dict[str, Any]) -> List[SecurityCheckResult]:
         """Perform all 14 security checks"""
+        return self._run(self._perform_security_checks_steps(address, safe_data))
+
+    def _perform_security_checks_steps(self, address: str, safe_data: Dict[str, Any]) -> Generator:
         checks = []
 
         # Extract data
@@ -688,7 +3349,7 @@ class SafeAnalyzer:
         ))
 
         # 3. Safe Version
-        latest_version, second_latest_version = self.get_latest_safe_version()
+        latest_version, second_latest_version = yield from self._get_latest_safe_version_steps()
         version_status = self.compare_versions(version, latest_version, second_latest_version)
 
         if version_status == 'latest':
@@ -718,7 +3379,7 @@ class SafeAnalyzer:
         ))
 
         # 4. Contract Creation Date
-        creation_date = self.get_contract_creation_date(address)
+        creation_date = yield from self._get_contract_creation_date_steps(address)
         if creation_date:
             days_since_creation = (datetime.now() - creation_date).days
 
@@ -762,16 +3423,17 @@ class SafeAnalyzer:
 
         # 6. Last Transaction Date
         # Check nonce first - if it's 0, this Safe has never executed a transaction
+        last_tx_date = None
         if nonce == 0:
             status = "warning"
             message = "No transactions found. This Safe has never been used."
         else:
-            last_tx_date = self.get_last_transaction_date(address)
+            last_tx_date = yield from self._get_last_transaction_date_steps(address)
             if last_tx_date:
                 days_since_last_tx = (datetime.now() - last_tx_date).days
                 formatted_date = last_tx_date.strftime('%Y-%m-%d')
 
-                if days_since_last_tx >= 90:
+                if days_since_last_tx >= INACTIVITY_ERROR_DAYS:
                     status = "error"
                     message = f"Inactive for {days_since_last_tx} days. Last transaction: {formatted_date}."
                 elif days_since_last_tx > 30:
@@ -780,6 +3442,12 @@ class SafeAnalyzer:
                 else:
                     status = "success"
                     message = f"Recently active. Last transaction: {formatted_date} ({days_since_last_tx} days ago)."
+            elif address.lower() in self._inactive_since:
+                # The log scan stopped at the threshold without finding an execution
+                inactive_since = datetime.fromtimestamp(self._inactive_since[address.lower()])
+                status = "error"
+                message = (f"Inactive for {INACTIVITY_ERROR_DAYS}+ days. "
+                           f"No transaction since {inactive_since.strftime('%Y-%m-%d')}.")
             else:
                 # API error or other issue - nonce > 0 but couldn't get transaction date
                 status = "warning"
@@ -851,13 +3519,31 @@ class SafeAnalyzer:
         ))
 
         # 14. Multi-Chain Signer Analysis
-        multichain_result = self._check_multichain_deployment(address, safe_data)
+        multichain_result = yield from self._check_multichain_deployment_steps(address, safe_data)
         checks.append(multichain_result)
 
         return checks
 
     def analyze_safe(self, address: str) -> SafeAnalysisResult:
         """Perform complete Safe security analysis"""
+        retries = [0]
+        token = _RETRY_COUNTER.set(retries)
+        try:
+            # Pin every read of this analysis to one block, unless a batch pin is active
+            if self.block_number is not None:
+                result = self._run(self._analyze_safe_steps(address))
+            else:
+                self.pin_block()
+                try:
+                    result = self._run(self._analyze_safe_steps(address))
+                finally:
+                    self.unpin_block()
+        finally:
+            _RETRY_COUNTER.reset(token)
+        result.retries = retries[0]
+        return result
+
+    def _analyze_safe_steps(self, address: str) -> Generator:
         print(f"🔍 Analyzing Safe: {address}")
 
         # Validate address format
@@ -867,21 +3553,24 @@ class SafeAnalyzer:
                 chain=self.chain,
                 is_safe=False,
                 error="Invalid address format",
+                block_number=self.block_number,
                 analyzed_at=datetime.now().isoformat()
             )
 
         # Check if address is a contract
-        if not self.is_contract(address):
+        is_contract = yield from self._is_contract_steps(address)
+        if not is_contract:
             return SafeAnalysisResult(
                 address=address,
                 chain=self.chain,
                 is_safe=False,
                 error="Address is not a contract",
+                block_number=self.block_number,
                 analyzed_at=datetime.now().isoformat()
             )
 
         # Get Safe data
-        safe_data = self.get_safe_data(address)
+        safe_data = yield from self._get_safe_data_steps(address)
 
         if not safe_data or "version" not in safe_data:
             return SafeAnalysisResult(
@@ -889,13 +3578,14 @@ class SafeAnalyzer:
                 chain=self.chain,
                 is_safe=False,
                 error="Address does not appear to be a Gnosis Safe multisig",
+                block_number=self.block_number,
                 analyzed_at=datetime.now().isoformat()
             )
 
         print(f"✅ Confirmed Safe v{safe_data.get('version', 'unknown')}")
 
         # Perform security checks
-        checks = self.perform_security_checks(address, safe_data)
+        checks = yield from self._perform_security_checks_steps(address, safe_data)
 
         # Calculate security score
         security_score = self.calculate_security_score(checks)
@@ -913,9 +3603,399 @@ class SafeAnalyzer:
             fallback_handler=safe_data.get("fallback_handler"),
             security_score=security_score,
             checks=checks,
+            block_number=self.block_number,
             analyzed_at=datetime.now().isoformat()
         )
 
+class AsyncSafeAnalyzer(SafeAnalyzer):
+    """Asyncio Safe analyzer.
+
+    Runs the same analysis steps as SafeAnalyzer, but executes their I/O on
+    aiohttp connection pools (one per host class) shared with its other-chain
+    peers, so thousands of reads can be in flight from one thread. Endpoint pools, rate limiters,
+    circuit breakers and the RPC cache are shared with the blocking engine.
+    Public methods are coroutines; use it as an async context manager, or
+    await close() when done.
+    """
+
+    def __init__(self, chain: str, api_key: Union[str, List[str], None] = None, timeout: int = 30,
+                 cache: Optional[RpcCache] = None, hedge: bool = False, hedge_percentile: float = HEDGE_PERCENTILE,
+                 code_cache: Optional[CodeCache] = None, concurrency: int = ASYNC_CONCURRENCY,
+                 http_owner: Optional["AsyncSafeAnalyzer"] = None, pool_size: Optional[int] = None,
+                 facts: Optional[FactsStore] = None, last_activity: str = "auto"):
+        if aiohttp is None:
+            raise ImportError("AsyncSafeAnalyzer requires aiohttp (pip install aiohttp)")
+        # RPC connections sized from the analyses in flight, so the pool is never the bottleneck
+        pool_size = pool_size or min(ASYNC_CONNECTION_LIMIT, max(1, concurrency * ASYNC_CONNECTIONS_PER_ANALYSIS))
+        super().__init__(chain, api_key, timeout, cache=cache, hedge=hedge, hedge_percentile=hedge_percentile,
+                         code_cache=code_cache, pool_size=pool_size, facts=facts, last_activity=last_activity)
+        self.concurrency = concurrency
+        self._http: Dict[str, "aiohttp.ClientSession"] = {}
+        self._http_owner = http_owner
+        self._active_analyses = 0
+        self._shared_pin: Optional[asyncio.Future] = None
+        self._peer_pins: Dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "AsyncSafeAnalyzer":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP connection pools and the hedge worker threads"""
+        self._shutdown_hedge_executor()
+        sessions, self._http = self._http, {}
+        for session in sessions.values():
+            await session.close()
+
+    def _http_session(self, host_class: str) -> "aiohttp.ClientSession":
+        """The aiohttp session of a host class, created on first use and shared with peers"""
+        if self._http_owner is not None:
+            return self._http_owner._http_session(host_class)
+        session = self._http.get(host_class)
+        if session is None:
+            if host_class == "rpc":
+                limit = self.pool_size
+            elif host_class == "explorer":
+                limit = self.explorer_pool_size
+            else:
+                limit = TRANSPORT_POOL_SIZES[host_class]
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=limit,
+                    limit_per_host=limit,
+                    keepalive_timeout=TRANSPORT_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=TRANSPORT_DNS_CACHE_TTL,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Accept-Encoding": HTTP_ACCEPT_ENCODING}
+            )
+            self._http[host_class] = session
+        return session
+
+    def _create_peer(self, chain: str) -> "AsyncSafeAnalyzer":
+        return AsyncSafeAnalyzer(chain, timeout=self.timeout, cache=self.cache,
+                                 hedge=self.hedge, hedge_percentile=self.hedge_percentile,
+                                 code_cache=self.code_cache, concurrency=self.concurrency, http_owner=self,
+                                 pool_size=self.pool_size, facts=self.facts)
+
+    async def _run(self, steps: Generator) -> Any:
+        """Run analysis steps, awaiting each I/O request they yield on the async transport"""
+        result, error = None, None
+        while True:
+            try:
+                request = steps.throw(error) if error else steps.send(result)
+            except StopIteration as done:
+                return done.value
+            result, error = None, None
+            try:
+                result = await self._execute(request)
+            except Exception as e:
+                error = e
+
+    async def _execute(self, request: tuple) -> Any:
+        op, *args = request
+        if op == "run_on":
+            analyzer, steps = args
+            return await analyzer._run(steps)
+        if op == "gather":
+            return list(await asyncio.gather(*(analyzer._run(steps) for analyzer, steps in args[0])))
+        return await getattr(self, op)(*args)
+
+    async def pin_block(self, block_number: Optional[int] = None) -> Optional[int]:
+        return await self._run(self._pin_block_steps(block_number))
+
+    def unpin_block(self):
+        self._peer_pins.clear()
+        super().unpin_block()
+
+    async def pin_peer(self, peer: "AsyncSafeAnalyzer") -> Optional[int]:
+        # Concurrent analyses needing the same peer share one pin
+        pinning = self._peer_pins.get(peer.chain)
+        if pinning is None:
+            pinning = asyncio.ensure_future(peer.pin_block())
+            self._peer_pins[peer.chain] = pinning
+        return await pinning
+
+    async def _post_rpc(self, endpoint: RpcEndpoint, payload: Union[dict, list]) -> Any:
+        # Wait for the limiter before claiming a half-open probe, so a task
+        # cancelled while waiting holds nothing the breaker depends on
+        delay = endpoint.limiter.try_acquire()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = endpoint.limiter.try_acquire()
+        if not endpoint.breaker.before_request():
+            endpoint.limiter.release("cancelled")
+            raise Exception(f"Circuit open for RPC endpoint {endpoint.url}")
+
+        outcome = "success"
+        started = time.monotonic()
+        try:
+            async with self._http_session("rpc").post(endpoint.url, json=payload) as response:
+                response.raise_for_status()
+                body = await read_json_response_async(response)
+            if is_rate_limited_response(body):
+                raise RequestError(f"RPC rate limited by {endpoint.url}", "throttled")
+        except (Exception, asyncio.CancelledError) as e:
+            outcome = request_outcome(e)
+            if outcome == "timeout":
+                raise RequestError(f"RPC request to {endpoint.url} timed out", "transient")
+            raise
+        finally:
+            endpoint.finish_request(outcome, time.monotonic() - started)
+        return body
+
+    async def _send_rpc(self, payload: Union[dict, list], decode) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return await self._send_rpc_once(payload, decode)
+            except Exception as e:
+                delay = self._rpc_retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _send_rpc_once(self, payload: Union[dict, list], decode) -> Any:
+        endpoints = self._rpc_endpoints()
+        if self._should_hedge(endpoints):
+            return await self._send_hedged(endpoints, payload, decode)
+
+        errors = []
+        for i, endpoint in enumerate(endpoints):
+            try:
+                return decode(await self._post_rpc(endpoint, payload))
+            except Exception as e:
+                self._collect_endpoint_error(e, errors)
+                if i < len(endpoints) - 1:
+                    print(f"RPC endpoint {endpoint.url} failed for {self.chain_config['name']}, trying next endpoint")
+
+        raise combine_errors(errors)
+
+    async def _send_hedged(self, endpoints: List[RpcEndpoint], payload: Union[dict, list], decode) -> Any:
+        """Hedged send as in SafeAnalyzer, except that losing requests are cancelled on the wire"""
+        async def attempt(endpoint: RpcEndpoint):
+            return decode(await self._post_rpc(endpoint, payload))
+
+        remaining = list(endpoints)
+        first = remaining.pop(0)
+        pending = {asyncio.ensure_future(attempt(first))}
+        done, _ = await asyncio.wait(pending, timeout=self._hedge_delay(first))
+        if not done:
+            pending.add(asyncio.ensure_future(attempt(remaining.pop(0))))
+
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        self._collect_endpoint_error(e, errors)
+                if remaining and not pending:
+                    # Nothing left in flight, go to the next endpoint right away
+                    pending.add(asyncio.ensure_future(attempt(remaining.pop(0))))
+        finally:
+            for loser in pending:
+                loser.cancel()
+
+        raise combine_errors(errors)
+
+    async def rpc_call(self, method: str, params: list) -> dict:
+        hit, cached = self._cache_get(method, params)
+        if hit:
+            return cached
+
+        key, flight, leader = self.single_flight.join(method, params)
+        if not leader:
+            return await asyncio.shield(asyncio.wrap_future(flight))
+
+        result = None
+        try:
+            result = await self._send_rpc(rpc_payload(method, params), decode_rpc_response)
+            self._cache_set(method, params, result)
+        except Exception as e:
+            if classify_error(e) != "revert":
+                print(f"All RPC endpoints failed for {self.chain_config['name']}: {e}")
+        finally:
+            self.single_flight.land(key, result)
+        return result
+
+    async def rpc_batch(self, calls: List[tuple]) -> List[Optional[Any]]:
+        results, missing = self._cache_lookup_batch(calls)
+        if not missing:
+            return results
+
+        leading, following = self._join_flights(calls, missing)
+        if leading:
+            self._cache_store_batch(calls, results, leading, await self._send_batch_leading(calls, leading))
+        for i, flight in following.items():
+            results[i] = await asyncio.shield(asyncio.wrap_future(flight))
+        return results
+
+    async def _send_batch_leading(self, calls: List[tuple], leading: List[tuple]) -> list:
+        leading_calls = [calls[i] for i, _ in leading]
+        fetched = [None] * len(leading_calls)
+        try:
+            fetched = await self._send_rpc(
+                rpc_batch_payload(leading_calls),
+                lambda body: decode_rpc_batch_response(body, len(leading_calls))
+            )
+        except Exception as e:
+            if classify_error(e) == "log_range":
+                raise
+            print(f"All RPC endpoints failed a batch for {self.chain_config['name']}: {e}")
+        finally:
+            for (_, key), result in zip(leading, fetched):
+                self.single_flight.land(key, result)
+        return fetched
+
+    async def explorer_api_call(self, params: dict) -> dict:
+        params = {key: str(value) for key, value in self._explorer_params(params).items()}
+
+        attempt = 0
+        while True:
+            try:
+                return await self._explorer_get(params)
+            except Exception as e:
+                delay = next_retry_delay(e, attempt, "explorer API call")
+                if delay is None:
+                    print(f"Explorer API call failed: {e}")
+                    return {"status": "0", "message": str(e)}
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _explorer_get(self, params: dict) -> dict:
+        key, delay = self.explorer_keys.try_acquire()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            key, delay = self.explorer_keys.try_acquire()
+        if key:
+            params = dict(params, apikey=key)
+
+        outcome = "error"
+        try:
+            async with self._http_session("explorer").get(self.chain_config["explorer_api"], params=params) as response:
+                if response.status == 429:
+                    outcome = "throttled"
+                response.raise_for_status()
+                result = await read_json_response_async(response)
+            throttled = self._explorer_throttled(key, result)
+            if throttled:
+                outcome = "throttled"
+                raise throttled
+            outcome = "success"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise RequestError("Explorer API request timed out", "transient")
+        finally:
+            self.explorer_keys.release(key, outcome)
+
+    async def http_get_json(self, url: str) -> Any:
+        async with self._http_session("github").get(url) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def multicall(self, calls: List[tuple]) -> Optional[List[Optional[memoryview]]]:
+        return await self._run(self._multicall_steps(calls))
+
+    async def get_code_info(self, address: str) -> Optional[CodeInfo]:
+        return await self._run(self._code_info_steps(address))
+
+    async def is_contract(self, address: str) -> bool:
+        return await self._run(self._is_contract_steps(address))
+
+    async def get_safe_data(self, address: str) -> Dict[str, Any]:
+        return await self._run(self._get_safe_data_steps(address))
+
+    async def prefetch_safe_data(self, addresses: List[str], chunk_size: int = MULTICALL_CHUNK_SIZE) -> int:
+        return await self._run(self._prefetch_safe_data_steps(addresses, chunk_size))
+
+    async def prefetch_contract_creations(self, addresses: List[str]) -> int:
+        return await self._run(self._prefetch_contract_creations_steps(addresses))
+
+    async def prefetch_last_activity(self, addresses: List[str]) -> int:
+        return await self._run(self._prefetch_last_activity_steps(addresses))
+
+    async def get_contract_creation_date(self, address: str) -> Optional[datetime]:
+        return await self._run(self._get_contract_creation_date_steps(address))
+
+    async def get_last_transaction_date(self, address: str) -> Optional[datetime]:
+        return await self._run(self._get_last_transaction_date_steps(address))
+
+    async def get_latest_safe_version(self) -> tuple[Optional[str], Optional[str]]:
+        return await self._run(self._get_latest_safe_version_steps())
+
+    async def perform_security_checks(self, address: str, safe_data: Dict[str, Any]) -> List[SecurityCheckResult]:
+        return await self._run(self._perform_security_checks_steps(address, safe_data))
+
+    async def analyze_safe(self, address: str) -> SafeAnalysisResult:
+        """Perform complete Safe security analysis.
+
+        Analyses that overlap on one analyzer share a single block pin, taken by
+        the first and released when the last one finishes.
+        """
+        if self._active_analyses == 0 and self.block_number is None:
+            self._shared_pin = asyncio.ensure_future(self.pin_block())
+        self._active_analyses += 1
+        retries = [0]
+        token = _RETRY_COUNTER.set(retries)
+        try:
+            if self._shared_pin is not None:
+                await self._shared_pin
+            result = await self._run(self._analyze_safe_steps(address))
+        finally:
+            _RETRY_COUNTER.reset(token)
+            self._active_analyses -= 1
+            if self._active_analyses == 0 and self._shared_pin is not None:
+                self._shared_pin = None
+                self.unpin_block()
+        result.retries = retries[0]
+        return result
+
+    async def analyze_many(self, addresses: List[str], concurrency: Optional[int] = None,
+                           chunk_size: int = MULTICALL_CHUNK_SIZE) -> List[SafeAnalysisResult]:
+        """Analyze many Safes with at most `concurrency` analyses in flight.
+
+        The batch is read at one block and its Safe data is prefetched in packed
+        multicalls, its creation dates in batched explorer lookups and its last
+        executions in one log scan, before the analyses start. Results are in input order; an
+        analysis that raises yields an error result instead of failing the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def analyze_one(address: str) -> SafeAnalysisResult:
+            async with semaphore:
+                try:
+                    return await self.analyze_safe(address)
+                except Exception as e:
+                    print(f"❌ Error analyzing {address}: {e}")
+                    return SafeAnalysisResult(
+                        address=address,
+                        chain=self.chain,
+                        is_safe=False,
+                        error=str(e),
+                        block_number=self.block_number,
+                        analyzed_at=datetime.now().isoformat()
+                    )
+
+        pinned_here = self.block_number is None
+        if pinned_here:
+            await self.pin_block()
+        try:
+            if len(addresses) > 1:
+                await self.prefetch_safe_data(addresses, chunk_size=chunk_size)
+                await self.prefetch_contract_creations(addresses)
+                await self.prefetch_last_activity(addresses)
+            return list(await asyncio.gather(*(analyze_one(address) for address in addresses)))
+        finally:
+            if pinned_here:
+                self.unpin_block()
+
 def format_human_readable(result: SafeAnalysisResult) -> str:
     """Format result for human-readable output"""
     output = []
@@ -924,6 +4004,8 @@ def format_human_readable(result: SafeAnalysisResult) -> str:
     output.append(f"Address: {result.address}")
     output.append(f"Chain: {result.chain}")
     output.append(f"Analyzed: {result.analyzed_at}")
+    if result.block_number is not None:
+        output.append(f"Block: {result.block_number}")
     output.append("")
 
     if not result.is_safe:
@@ -957,6 +4039,67 @@ def format_human_readable(result: SafeAnalysisResult) -> str:
 
     return "\n".join(output)
 
+def analyze_blocking(args, addresses: List[str], cache: Optional[RpcCache],
+                     code_cache: Optional[CodeCache], facts: Optional[FactsStore]) -> List[SafeAnalysisResult]:
+    """Analyze addresses one after another on the blocking engine"""
+    with SafeAnalyzer(args.chain, args.api_key, cache=cache,
+                      hedge=args.hedge, hedge_percentile=args.hedge_percentile,
+                      code_cache=code_cache, pool_size=args.pool_size, facts=facts,
+                      last_activity=args.last_activity) as analyzer:
+        # Pin the whole run to one block so every Safe is read at the same state
+        if args.block is not None or len(addresses) > 1:
+            block_number = analyzer.pin_block(args.block)
+            if block_number is not None:
+                print(f"📌 Reading {analyzer.chain_config['name']} state at block {block_number}")
+
+        # Fetch Safe data for the whole batch up front in packed multicalls,
+        # creation dates in batched explorer lookups and last executions in one log scan
+        if len(addresses) > 1:
+            analyzer.prefetch_safe_data(addresses, chunk_size=args.multicall_chunk_size)
+            analyzer.prefetch_contract_creations(addresses)
+            analyzer.prefetch_last_activity(addresses)
+
+        # Analyze addresses
+        results = []
+        for i, address in enumerate(addresses, 1):
+            if len(addresses) > 1:
+                print(f"\n📍 Analyzing {i}/{len(addresses)}: {address}")
+
+            try:
+                result = analyzer.analyze_safe(address)
+                results.append(result)
+
+                if args.output == "human" and not args.file:
+                    print(format_human_readable(result))
+                    if i < len(addresses):
+                        print("\n" + "="*80 + "\n")
+
+            except Exception as e:
+                print(f"❌ Error analyzing {address}: {e}")
+                results.append(SafeAnalysisResult(
+                    address=address,
+                    chain=args.chain,
+                    is_safe=False,
+                    error=str(e),
+                    block_number=analyzer.block_number,
+                    analyzed_at=datetime.now().isoformat()
+                ))
+
+        return results
+
+async def analyze_async(args, addresses: List[str], cache: Optional[RpcCache],
+                        code_cache: Optional[CodeCache], facts: Optional[FactsStore]) -> List[SafeAnalysisResult]:
+    """Analyze addresses concurrently on the asyncio engine"""
+    async with AsyncSafeAnalyzer(args.chain, args.api_key, cache=cache, hedge=args.hedge,
+                                 hedge_percentile=args.hedge_percentile, code_cache=code_cache,
+                                 concurrency=args.concurrency, pool_size=args.pool_size, facts=facts,
+                                 last_activity=args.last_activity) as analyzer:
+        if args.block is not None or len(addresses) > 1:
+            block_number = await analyzer.pin_block(args.block)
+            if block_number is not None:
+                print(f"📌 Reading {analyzer.chain_config['name']} state at block {block_number}")
+        return await analyzer.analyze_many(addresses, chunk_size=args.multicall_chunk_size)
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze Gnosis Safe multisig security")
     parser.add_argument("--address", type=str, help="Safe address to analyze")
@@ -965,16 +4108,59 @@ def main():
                        default="ethereum", help="Blockchain network")
     parser.add_argument("--output", choices=["human", "json", "csv"],
                        default="human", help="Output format")
-    parser.add_argument("--api-key", type=str, help="Etherscan v2 API key for enhanced data")
+    parser.add_argument("--api-key", action="append", default=[],
+                       help="Etherscan v2 API key for enhanced data (repeatable; requests are spread over all keys)")
     parser.add_argument("--file", type=str, help="Output file path")
+    parser.add_argument("--block", type=int,
+                       help="Block number to read Safe state at (default: chain head when the run starts)")
+    parser.add_argument("--cache-db", type=str,
+                       help="SQLite file for caching RPC responses and bytecode facts between runs")
+    parser.add_argument("--facts-db", type=str,
+                       help="SQLite file for permanent per-contract facts such as creation dates (default: --cache-db)")
+    parser.add_argument("--cache-ttl", type=float, default=RPC_CACHE_LATEST_TTL,
+                       help="Seconds a cached response read at the latest block stays valid")
+    parser.add_argument("--cache-max-entries", type=int, default=RPC_CACHE_MAX_ENTRIES,
+                       help="Maximum cached RPC responses before least recently used ones are evicted")
+    parser.add_argument("--rpc-url", action="append", default=[], metavar="[CHAIN=]URL",
+                       help="Additional RPC endpoint, for --chain unless prefixed with a chain name (repeatable)")
+    parser.add_argument("--hedge", action="store_true",
+                       help="Race slow RPC requests against the next best endpoint")
+    parser.add_argument("--hedge-percentile", type=float, default=HEDGE_PERCENTILE,
+                       help="Endpoint latency percentile after which a hedged request is sent")
+    parser.add_argument("--async", dest="async_mode", action="store_true",
+                       help="Analyze concurrently on the asyncio engine (requires aiohttp)")
+    parser.add_argument("--concurrency", type=int, default=ASYNC_CONCURRENCY,
+                       help="Safes analyzed at once with --async")
+    parser.add_argument("--pool-size", type=int,
+                       help="Pooled connections per RPC host (default: sized from --concurrency, or hedge workers)")
+    parser.add_argument("--last-activity", choices=list(LAST_ACTIVITY_SOURCES), default="auto",
+                       help="Source of the last transaction date: Safe execution logs over RPC, explorer txlist, "
+                            "or logs with txlist as fallback (auto)")
+    parser.add_argument("--multicall-chunk-size", type=int, default=MULTICALL_CHUNK_SIZE,
+                       help="Maximum calls per Multicall3 request when prefetching a batch")
 
     args = parser.parse_args()
 
     if not args.address and not args.batch:
         parser.error("Must specify either --address or --batch")
 
-    # Create analyzer
-    analyzer = SafeAnalyzer(args.chain, args.api_key)
+    # Register extra RPC endpoints
+    for rpc_url in args.rpc_url:
+        chain, separator, url = rpc_url.partition("=")
+        if not separator or chain not in SUPPORTED_CHAINS:
+            chain, url = args.chain, rpc_url
+        add_rpc_endpoint(chain, url)
+
+    cache = None
+    code_cache = None
+    if args.cache_db:
+        cache = RpcCache(args.cache_db, latest_ttl=args.cache_ttl, max_entries=args.cache_max_entries)
+        code_cache = CodeCache(args.cache_db)
+
+    facts = None
+    facts_db = args.facts_db or args.cache_db
+    if facts_db:
+        facts = FactsStore(facts_db)
 
     # Collect addresses to analyze
     addresses = []
@@ -989,30 +4175,15 @@ def main():
             print(f"❌ Batch file not found: {args.batch}")
             sys.exit(1)
 
-    # Analyze addresses
-    results = []
-    for i, address in enumerate(addresses, 1):
-        if len(addresses) > 1:
-            print(f"\n📍 Analyzing {i}/{len(addresses)}: {address}")
-
-        try:
-            result = analyzer.analyze_safe(address)
-            results.append(result)
-
-            if args.output == "human" and not args.file:
+    if args.async_mode:
+        results = asyncio.run(analyze_async(args, addresses, cache, code_cache, facts))
+        if args.output == "human" and not args.file:
+            for i, result in enumerate(results, 1):
                 print(format_human_readable(result))
-                if i < len(addresses):
+                if i < len(results):
                     print("\n" + "="*80 + "\n")
-
-        except Exception as e:
-            print(f"❌ Error analyzing {address}: {e}")
-            results.append(SafeAnalysisResult(
-                address=address,
-                chain=args.chain,
-                is_safe=False,
-                error=str(e),
-                analyzed_at=datetime.now().isoformat()
-            ))
+    else:
+        results = analyze_blocking(args, addresses, cache, code_cache, facts)
 
     # Output results to file if specified
     if args.file:
@@ -1028,7 +4199,8 @@ def main():
                     # Header
                     writer.writerow([
                         "address", "chain", "is_safe", "version", "threshold", "owner_count",
-                        "nonce", "module_count", "security_score", "security_rating", "error"
+                        "nonce", "module_count", "security_score", "security_rating", "error",
+                        "block_number", "retries"
                     ])
                     # Data
                     for result in results:
@@ -1038,7 +4210,9 @@ def main():
                             result.nonce, len(result.modules) if result.modules else 0,
                             result.security_score.score if result.security_score else None,
                             result.security_score.rating if result.security_score else None,
-                            result.error
+                            result.error,
+                            result.block_number,
+                            result.retries
                         ])
                 print(f"💾 Results saved to {args.file}")
 
@@ -1058,5 +4232,29 @@ def main():
         safe_count = sum(1 for r in results if r.is_safe)
         print(f"\n📊 Analysis Summary: {safe_count}/{len(results)} valid Safes analyzed")
 
+    retries = sum(r.retries for r in results)
+    if retries:
+        print(f"🔁 Retried {retries} failed requests")
+
+    coalesced = sum(flights.coalesced for flights in _SINGLE_FLIGHTS.values())
+    if coalesced:
+        print(f"🔁 Coalesced {coalesced} duplicate in-flight RPC reads")
+
+    if cache:
+        stats = cache.stats()
+        print(f"🗄️  RPC cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        cache.close()
+
+    if code_cache:
+        stats = code_cache.stats()
+        print(f"🧬 Code cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['entries']} entries, {stats['classified']} classified code hashes")
+        code_cache.close()
+
+    if facts:
+        stats = facts.stats()
+        print(f"📜 Facts store: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+        facts.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
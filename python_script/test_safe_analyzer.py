@@ -0,0 +1,456 @@
+"""Regression tests for safe_analyzer. Run with: python -m unittest test_safe_analyzer"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+import safe_analyzer
+from safe_analyzer import (
+    CircuitBreaker, CodeCache, ContractCreation, FactsStore, RpcCache, RpcEndpoint, RpcEndpointPool
+)
+
+
+def run_steps(steps, rpc_batch):
+    """Run analysis steps like SafeAnalyzer._run, answering rpc_batch requests with `rpc_batch(calls)`"""
+    response = None
+    while True:
+        try:
+            op = steps.send(response)
+        except StopIteration as stop:
+            return stop.value
+        if op[0] == "gather":
+            response = [run_steps(nested, rpc_batch) for _, nested in op[1]]
+        else:
+            assert op[0] == "rpc_batch", op
+            response = rpc_batch(op[1])
+
+
+class KeccakTest(unittest.TestCase):
+    def test_known_digests(self):
+        self.assertEqual(safe_analyzer.keccak256(b"").hex(),
+                         "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470")
+        self.assertEqual(safe_analyzer.keccak256(b"abc").hex(),
+                         "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45")
+        # Longer than the 136-byte rate, so more than one block is absorbed
+        self.assertEqual(safe_analyzer.keccak256(b"a" * 200), safe_analyzer.keccak256("a" * 200))
+
+    def test_safe_selectors(self):
+        selectors = {name: function.selector_hex for name, function in safe_analyzer.SAFE_ABI.items()}
+        self.assertEqual(selectors["getThreshold"], "0xe75235b8")
+        self.assertEqual(selectors["getOwners"], "0xa0e67e2b")
+        self.assertEqual(selectors["nonce"], "0xaffed0e0")
+        self.assertEqual(selectors["VERSION"], "0xffa1ad74")
+        self.assertEqual(selectors["getModulesPaginated"], "0xcc2f8452")
+
+
+class AbiCodecTest(unittest.TestCase):
+    OWNERS = ["0x%040x" % (0xa0 + i) for i in range(3)]
+
+    def round_trip(self, types: list, values: tuple) -> tuple:
+        encoded = safe_analyzer._abi_encode_sequence([safe_analyzer._compile_abi_type(t) for t in types], values)
+        self.assertEqual(len(encoded) % 32, 0)
+        return safe_analyzer.abi_decode(safe_analyzer.make_decode_plan(types), encoded)
+
+    def test_address_array_round_trip(self):
+        self.assertEqual(self.round_trip(["address[]"], (self.OWNERS,)), (self.OWNERS,))
+        self.assertEqual(self.round_trip(["address[]"], ([],)), ([],))
+
+    def test_address_array_and_address_round_trip(self):
+        values = (self.OWNERS, safe_analyzer.SENTINEL_MODULES)
+        self.assertEqual(self.round_trip(["address[]", "address"], values), values)
+        self.assertEqual(self.round_trip(["(address[],address)"], (values,)), (values,))
+
+    def test_bytes_round_trip(self):
+        for value in (b"", b"\x01", bytes(range(33))):
+            self.assertEqual(bytes(self.round_trip(["bytes"], (value,))[0]), value)
+
+    def test_encode_call(self):
+        call = safe_analyzer.encode_modules_paginated(safe_analyzer.SENTINEL_MODULES, 10)
+        self.assertEqual(call, "0xcc2f8452" + "%064x" % 1 + "%064x" % 10)
+
+    def test_malformed_return_data_is_rejected(self):
+        get_owners = safe_analyzer.SAFE_ABI["getOwners"]
+        encoded = safe_analyzer._abi_encode_sequence([safe_analyzer._compile_abi_type("address[]")], (self.OWNERS,))
+        for malformed in (b"", encoded[:31], encoded[:-1], encoded[:64] + encoded[96:]):
+            with self.assertRaises(ValueError):
+                get_owners.decode_output(malformed)
+        self.assertEqual(get_owners.decode_outputs([encoded, encoded[:-1], None]), [(self.OWNERS,), None, None])
+
+
+class RpcCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "cache.sqlite")
+
+    def params(self, i: int, block: str = "0x10") -> list:
+        return ["0x%040x" % i, "0x0", block]
+
+    def test_evicts_least_recently_used_beyond_max_entries(self):
+        cache = RpcCache(self.path, max_entries=100)
+        for i in range(100):
+            cache.set(1, "eth_getStorageAt", self.params(i), "0x01")
+        cache.get(1, "eth_getStorageAt", self.params(0))  # recently used, survives eviction
+        for i in range(100, 150):
+            cache.set(1, "eth_getStorageAt", self.params(i), "0x01")
+
+        self.assertLessEqual(cache.stats()["entries"], 100)
+        self.assertTrue(cache.get(1, "eth_getStorageAt", self.params(0))[0])
+        self.assertFalse(cache.get(1, "eth_getStorageAt", self.params(1))[0])
+        self.assertTrue(cache.get(1, "eth_getStorageAt", self.params(149))[0])
+        cache.close()
+
+    def test_buffered_writes_persist_after_close(self):
+        cache = RpcCache(self.path)
+        cache.set(1, "eth_getStorageAt", self.params(1), "0x01")
+        cache.close()
+
+        cache = RpcCache(self.path)
+        self.assertEqual(cache.get(1, "eth_getStorageAt", self.params(1)), (True, "0x01"))
+        cache.close()
+
+    def test_pinned_blocks_near_the_head_expire(self):
+        cache = RpcCache(self.path, latest_ttl=0)
+        cache.set(1, "eth_blockNumber", [], "0x1000")
+        head = self.params(1, "0x1000")
+        final = self.params(2, hex(0x1000 - safe_analyzer.RPC_CACHE_CONFIRMATIONS))
+        cache.set(1, "eth_getStorageAt", head, "0x01")
+        cache.set(1, "eth_getStorageAt", final, "0x01")
+        time.sleep(0.01)
+
+        self.assertFalse(cache.get(1, "eth_getStorageAt", head)[0])
+        self.assertTrue(cache.get(1, "eth_getStorageAt", final)[0])
+        cache.close()
+
+    def test_pinned_blocks_expire_until_the_head_is_known(self):
+        cache = RpcCache(self.path, latest_ttl=0)
+        cache.set(1, "eth_getStorageAt", self.params(1, "0x10"), "0x01")
+        time.sleep(0.01)
+        self.assertFalse(cache.get(1, "eth_getStorageAt", self.params(1, "0x10"))[0])
+        cache.close()
+
+    def test_latest_responses_expire(self):
+        cache = RpcCache(self.path, latest_ttl=0)
+        cache.set(1, "eth_getStorageAt", self.params(1, "latest"), "0x01")
+        time.sleep(0.01)
+        self.assertFalse(cache.get(1, "eth_getStorageAt", self.params(1, "latest"))[0])
+        cache.close()
+
+
+class SharedDatabaseTest(unittest.TestCase):
+    def test_stores_sharing_a_file_write_without_locking_each_other(self):
+        path = os.path.join(tempfile.mkdtemp(), "cache.sqlite")
+        cache, code_cache, facts = RpcCache(path), CodeCache(path), FactsStore(path)
+        for i in range(safe_analyzer.SQLITE_COMMIT_INTERVAL + 1):
+            address = "0x%040x" % i
+            cache.set(1, "eth_getStorageAt", [address, "0x0", "0x10"], "0x01")
+            code_cache.put(1, address, 16, "0x6001")
+            facts.put_creation(1, address, ContractCreation(block_number=16, timestamp=1700000000))
+        cache.close()
+        code_cache.close()
+        facts.close()
+
+        code_cache, facts = CodeCache(path), FactsStore(path)
+        self.assertEqual(code_cache.stats()["entries"], safe_analyzer.SQLITE_COMMIT_INTERVAL + 1)
+        self.assertEqual(facts.get_creation(1, "0x%040x" % 0).timestamp, 1700000000)
+        code_cache.close()
+        facts.close()
+
+
+class CodeCacheTest(unittest.TestCase):
+    def test_code_hash_is_the_evm_code_hash(self):
+        info = CodeCache().inspect("0x%040x" % 1, "0x00")
+        self.assertEqual(info.code_hash, "0xbc36789e7a1e281436464229828f817d6612f7b477d66591ff96a9e064bcc98a")
+        self.assertIsNone(CodeCache().inspect("0x%040x" % 1, "0x").code_hash)
+
+
+class ModuleWalkTest(unittest.TestCase):
+    def test_bulk_decoded_first_pages_stay_packed_until_parsed(self):
+        def page(modules: list, next_module: str) -> bytes:
+            words = [64, int(next_module, 16), len(modules)] + [int(module, 16) for module in modules]
+            return b"".join(word.to_bytes(32, "big") for word in words)
+
+        modules = [["0x%040x" % (1000 + i)] for i in range(safe_analyzer.BULK_DECODE_MIN_PAYLOADS)]
+        per_safe = [{"getModulesPaginated": page(page_modules, safe_analyzer.SENTINEL_MODULES)}
+                    for page_modules in modules]
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum")
+        steps = analyzer._walk_modules_steps(["0x%040x" % i for i in range(len(per_safe))], per_safe)
+        with self.assertRaises(StopIteration):
+            next(steps)
+
+        self.assertIsInstance(per_safe[0]["modules"][0], safe_analyzer.PackedAddresses)
+        self.assertEqual([analyzer._parse_safe_results(results)["modules"] for results in per_safe], modules)
+
+
+class SafeDataPrefetchTest(unittest.TestCase):
+    def prefetch(self, analyzer, addresses: list, storage: dict):
+        """Run _prefetch_safe_data_steps, answering getThreshold and the storage slots only"""
+        steps = analyzer._prefetch_safe_data_steps(addresses)
+        response = None
+        try:
+            while True:
+                op = steps.send(response)
+                self.assertEqual(op[0], "rpc_batch")
+                response = []
+                for method, params in op[1]:
+                    if method == "eth_getStorageAt":
+                        response.append(storage[params[0]])
+                    elif params[0]["data"] == safe_analyzer.SAFE_FUNCTION_SIGS["getThreshold"]:
+                        response.append("0x" + "%064x" % 2)
+                    else:
+                        response.append(None)
+        except StopIteration as stop:
+            return stop.value
+
+    def test_malformed_storage_word_only_drops_that_safe(self):
+        good, bad = "0x%040x" % 1, "0x%040x" % 2
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum")
+        analyzer.multicall3_address = None
+        self.assertEqual(self.prefetch(analyzer, [good, bad], {good: "0x" + "00" * 32, bad: "0x0"}), 1)
+        self.assertEqual(analyzer._prefetched_safe_data[good]["threshold"], 2)
+        self.assertNotIn(bad, analyzer._prefetched_safe_data)
+
+    def test_repinning_forgets_prefetched_data(self):
+        address = "0x%040x" % 1
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum")
+        analyzer.multicall3_address = None
+        analyzer.pin_block(100)
+        self.prefetch(analyzer, [address], {address: "0x" + "00" * 32})
+        self.assertIn(address, analyzer._prefetched_safe_data)
+
+        analyzer.pin_block(100)
+        self.assertIn(address, analyzer._prefetched_safe_data)
+        analyzer.pin_block(200)
+        self.assertNotIn(address, analyzer._prefetched_safe_data)
+
+
+class ContractCreationBatchTest(unittest.TestCase):
+    def test_code_probes_are_sent_in_bounded_batches(self):
+        deployed = {"0x%040x" % i: 1_000 + i for i in range(2 * safe_analyzer.MULTICALL_CHUNK_SIZE + 1)}
+        batch_sizes = []
+
+        def rpc_batch(calls):
+            batch_sizes.append(len(calls))
+            return ["0x6001" if int(block, 16) >= deployed[address] else "0x" for _, (address, block) in calls]
+
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum")
+        analyzer.block_number = 100_000
+        found, _ = run_steps(analyzer._search_creation_blocks_steps(list(deployed)), rpc_batch)
+
+        self.assertEqual(found, deployed)
+        self.assertLessEqual(max(batch_sizes), safe_analyzer.MULTICALL_CHUNK_SIZE)
+
+
+    def test_creations_are_dated_in_bounded_batches(self):
+        count = 2 * safe_analyzer.MULTICALL_CHUNK_SIZE + 1
+        creations = [safe_analyzer.ContractCreation(None, None, tx_hash="0x%064x" % i) for i in range(count)]
+        batch_sizes = []
+
+        def rpc_batch(calls):
+            batch_sizes.append(len(calls))
+            return [
+                {"blockNumber": params[0][:2] + params[0][-6:]} if method == "eth_getTransactionByHash"
+                else {"timestamp": hex(1_600_000_000 + int(params[0], 16))}
+                for method, params in calls
+            ]
+
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum")
+        run_steps(analyzer._date_creations_steps(creations), rpc_batch)
+
+        self.assertEqual([creation.timestamp for creation in creations], [1_600_000_000 + i for i in range(count)])
+        self.assertLessEqual(max(batch_sizes), safe_analyzer.MULTICALL_CHUNK_SIZE)
+
+
+class ExecutionLogScanTest(unittest.TestCase):
+    """Drives _scan_executions_steps against a node that refuses block ranges over 10,000"""
+
+    HEAD = 2_000_000
+    BLOCK_TIME = 12
+
+    def respond(self, method: str, params: list, executions: dict):
+        if method == "eth_getBlockByNumber":
+            age = (self.HEAD - int(params[0], 16)) * self.BLOCK_TIME
+            return {"result": {"timestamp": hex(int(time.time()) - age)}}
+        log_filter = params[0]
+        from_block, to_block = int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16)
+        if to_block - from_block + 1 > 10_000:
+            return {"error": {"code": -32005, "message": "query exceeds max block range 10000"}}
+        return {"result": [
+            {"address": address, "blockNumber": hex(block)}
+            for address, block in executions.items()
+            if address in log_filter["address"] and from_block <= block <= to_block
+        ]}
+
+    def scan(self, executions: dict, transport_error: bool = False) -> tuple:
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum", last_activity="rpc")
+        analyzer.block_number = self.HEAD
+        steps = analyzer._scan_executions_steps(list(executions))
+        self.batch_sizes = []
+        response, error = None, None
+        try:
+            while True:
+                op = steps.throw(error) if error else steps.send(response)
+                response, error = None, None
+                self.assertEqual(op[0], "rpc_batch")
+                self.batch_sizes.append(len(op[1]))
+                if transport_error:
+                    # What rpc_batch returns once every endpoint failed and retries ran out
+                    response = [None] * len(op[1])
+                    continue
+                body = [dict(self.respond(method, params, executions), id=i) for i, (method, params) in enumerate(op[1])]
+                try:
+                    response = safe_analyzer.decode_rpc_batch_response(body, len(op[1]))
+                except safe_analyzer.RequestError as e:
+                    error = e
+        except StopIteration as stop:
+            return stop.value
+
+    def test_stops_at_the_inactivity_threshold(self):
+        threshold_blocks = safe_analyzer.INACTIVITY_ERROR_DAYS * 86400 // self.BLOCK_TIME
+        recent = "0x%040x" % 1
+        dormant = "0x%040x" % 2
+        found, inactive, requests_made = self.scan({
+            recent: self.HEAD - 50_000,
+            dormant: self.HEAD - 2 * threshold_blocks,
+        })
+
+        self.assertEqual(found, {recent: self.HEAD - 50_000})
+        self.assertEqual(list(inactive), [dormant])
+        self.assertLessEqual(inactive[dormant], time.time() - safe_analyzer.INACTIVITY_ERROR_DAYS * 86400)
+        # Refused ranges are split within a batch instead of costing a request per 10,000 blocks
+        self.assertLess(requests_made, 10)
+
+
+    def test_many_safes_are_spread_over_capped_batches(self):
+        executions = {"0x%040x" % i: self.HEAD - 5_000 for i in range(60 * safe_analyzer.LOG_SCAN_ADDRESSES_PER_FILTER)}
+        found, _, requests_made = self.scan(executions)
+
+        self.assertEqual(len(found), len(executions))
+        self.assertEqual(requests_made, 2)
+        self.assertLessEqual(max(self.batch_sizes), safe_analyzer.LOG_SCAN_MAX_FILTERS_PER_REQUEST + 1)
+
+    def test_transport_failure_does_not_narrow_the_range(self):
+        found, inactive, requests_made = self.scan({"0x%040x" % 1: self.HEAD - 5_000}, transport_error=True)
+        self.assertEqual((found, inactive, requests_made), ({}, {}, 1))
+
+    def test_repinning_forgets_last_activity(self):
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum")
+        analyzer.pin_block(self.HEAD)
+        analyzer._last_activity["0x%040x" % 1] = int(time.time())
+        analyzer._inactive_since["0x%040x" % 2] = int(time.time()) - 100 * 86400
+        analyzer.pin_block(self.HEAD + 50_000)
+        self.assertEqual(analyzer._last_activity, {})
+        self.assertEqual(analyzer._inactive_since, {})
+
+    def test_inactive_safes_are_not_redated_from_txlist(self):
+        address = "0x%040x" % 2
+        analyzer = safe_analyzer.SafeAnalyzer("ethereum", "key", last_activity="auto")
+        analyzer.pin_block(self.HEAD)
+        analyzer._last_activity[address] = None
+        analyzer._inactive_since[address] = int(time.time()) - 100 * 86400
+
+        steps = analyzer._get_last_transaction_date_steps(address)
+        with self.assertRaises(StopIteration) as done:
+            next(steps)
+        self.assertIsNone(done.exception.value)
+
+
+class TransportOutcomeTest(unittest.TestCase):
+    def test_failures_map_to_limiter_outcomes(self):
+        outcome = safe_analyzer.request_outcome
+        self.assertEqual(outcome(asyncio.CancelledError()), "cancelled")
+        self.assertEqual(outcome(asyncio.TimeoutError()), "timeout")
+        self.assertEqual(outcome(safe_analyzer.requests.Timeout()), "timeout")
+        self.assertEqual(outcome(safe_analyzer.RequestError("rate limited", "throttled")), "throttled")
+        self.assertEqual(outcome(ValueError("bad body")), "error")
+
+    def test_finish_request_records_outcome_on_breaker_and_limiter(self):
+        endpoint = RpcEndpoint("http://127.0.0.1:9/rpc")
+
+        def admit():
+            # Throttling slows the limiter down; refill it so every request is admitted at once
+            endpoint.limiter.tokens = 1.0
+            self.assertEqual(endpoint.limiter.try_acquire(), 0.0)
+            self.assertTrue(endpoint.breaker.before_request())
+
+        for _ in range(endpoint.breaker.failure_threshold):
+            admit()
+            endpoint.finish_request("throttled", 0.0)
+        # Throttling means the endpoint is alive: no circuit opens
+        self.assertEqual(endpoint.breaker.state, CircuitBreaker.CLOSED)
+
+        admit()
+        endpoint.finish_request("success", 0.25)
+        self.assertEqual(list(endpoint.latencies), [0.25])
+
+        for _ in range(endpoint.breaker.failure_threshold):
+            admit()
+            endpoint.finish_request("timeout", 0.0)
+        self.assertEqual(endpoint.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(endpoint.limiter.in_flight, 0)
+
+    def test_close_shuts_down_hedge_workers(self):
+        with safe_analyzer.SafeAnalyzer("ethereum", hedge=True) as analyzer:
+            executor = safe_analyzer.ThreadPoolExecutor(max_workers=1)
+            analyzer._hedge_executor = executor
+        self.assertIsNone(analyzer._hedge_executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(time.sleep, 0)
+
+
+@unittest.skipIf(safe_analyzer.aiohttp is None, "AsyncSafeAnalyzer requires aiohttp")
+class AsyncPostRpcCancellationTest(unittest.TestCase):
+    def test_cancel_during_limiter_wait_keeps_half_open_probe_available(self):
+        async def scenario():
+            async with safe_analyzer.AsyncSafeAnalyzer("ethereum") as analyzer:
+                endpoint = RpcEndpoint("http://127.0.0.1:9/rpc")
+                pool = RpcEndpointPool([])
+                pool.endpoints.append(endpoint)
+
+                # Circuit open with its cooldown over: the next request is the half-open probe
+                endpoint.breaker.state = CircuitBreaker.OPEN
+                endpoint.breaker._opened_at = time.monotonic() - endpoint.breaker.cooldown
+                # Empty token bucket, so the request parks in the limiter wait
+                endpoint.limiter.rate = 0.5
+                endpoint.limiter.tokens = 0.0
+
+                task = asyncio.ensure_future(analyzer._post_rpc(endpoint, {"jsonrpc": "2.0"}))
+                await asyncio.sleep(0.05)
+                self.assertFalse(task.done())
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+                self.assertFalse(endpoint.breaker._probe_in_flight)
+                self.assertEqual(pool.ranked(), [endpoint])
+                self.assertEqual(endpoint.limiter.in_flight, 0)
+
+        asyncio.run(scenario())
+
+
+
+@unittest.skipIf(safe_analyzer.aiohttp is None, "AsyncSafeAnalyzer requires aiohttp")
+class AsyncSingleFlightTest(unittest.TestCase):
+    def test_cancelled_follower_leaves_the_flight_to_the_others(self):
+        async def scenario():
+            async with safe_analyzer.AsyncSafeAnalyzer("ethereum") as analyzer:
+                params = ["0x%040x" % 1, "0x0", "0x10"]
+                # Lead the flight from the test, so both rpc_calls follow it
+                key, _, leader = analyzer.single_flight.join("eth_getStorageAt", params)
+                self.assertTrue(leader)
+                cancelled = asyncio.ensure_future(analyzer.rpc_call("eth_getStorageAt", params))
+                waiting = asyncio.ensure_future(analyzer.rpc_call("eth_getStorageAt", params))
+                await asyncio.sleep(0.01)
+                cancelled.cancel()
+                await asyncio.sleep(0.01)
+
+                analyzer.single_flight.land(key, "0x01")
+                self.assertEqual(await waiting, "0x01")
+                with self.assertRaises(asyncio.CancelledError):
+                    await cancelled
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()